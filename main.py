@@ -22,9 +22,18 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 # Import core modules
 from src.core.scraper import AsyncDataScraper
+from src.core.crawler import close_crawler
+from src.core.extractors import shutdown_parse_executor
+from src.core.question_store import close_motor_clients
 from src.core.pdf_generator import ModernPDFGenerator
 from src.core.template_manager import TemplateManager
-from src.core.translator import translate_content, translate_with_gemini_api, is_primarily_gujarati
+from src.core.translator import translate_content, translate_contents, translate_with_gemini_api, is_primarily_gujarati, close_translation_store
+from src.core.translation_planner import (
+    TRANSLATION_PLANNER,
+    TranslationPlanner,
+    get_translation_queue,
+    close_translation_queue
+)
 from src.core.utils import (
     generate_qr_code, 
     ensure_dir_exists, 
@@ -145,6 +154,189 @@ def prepare_data_for_template(data: List[Dict[str, Any]], language: str = "en")
     return pdf_data
 
 
+async def generate_pdfs_for_date(
+    date: str,
+    date_questions: List[Dict[str, Any]],
+    languages: List[str],
+    qr_codes: Dict[str, str],
+    pdf_generator: ModernPDFGenerator,
+    output_files: Dict[str, List[str]],
+    translated_gu_data: Optional[Dict[str, Any]] = None,
+    translate: bool = True
+) -> None:
+    """Generate the requested language PDFs for one date
+    
+    Args:
+        date: Date of the questions (YYYY-MM-DD)
+        date_questions: Questions scraped for that date
+        languages: List of languages to generate PDFs for
+        qr_codes: QR code image paths keyed by channel
+        pdf_generator: PDF generator instance
+        output_files: Dictionary mapping language codes to generated PDF paths (updated in place)
+        translated_gu_data: Gujarati template data already translated by the caller
+        translate: Whether Gujarati content may be sent to Gemini (off for replays)
+    """
+    logger.info(f"Generating PDFs for date: {date} with {len(date_questions)} questions")
+    
+    # English PDF (if requested)
+    if "en" in languages:
+        logger.info(f"Generating English PDF for date: {date}")
+        
+        # Prepare data for template
+        en_pdf_data = prepare_data_for_template(date_questions, "en")
+        
+        # Add QR code and metadata
+        en_pdf_data.update({"english_qr": qr_codes.get('english_qr', '')})
+        en_pdf_data['generation_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        en_pdf_data['source'] = "IndiaBix"  # Adding source attribution
+        en_output_filename = f"current_affairs_{date}_en.pdf"
+        
+        try:
+            # Call generate_pdf with the correct parameters
+            en_output_path = await pdf_generator.generate_pdf(
+                template_name=CONFIG['templates']['base'],
+                data=en_pdf_data,
+                output_filename=en_output_filename
+            )
+            
+            if validate_pdf(en_output_path):
+                logger.info(f"Successfully generated English PDF: {en_output_path}")
+                output_files["en"].append(en_output_path)
+            else:
+                logger.error(f"Failed to validate English PDF: {en_output_path}")
+        except Exception as e:
+            logger.error(f"Error generating English PDF: {e}")
+    
+    # Gujarati PDF (if requested)
+    if "gu" in languages:
+        logger.info(f"Generating Gujarati PDF for date: {date}")
+        
+        # Prepare data for template
+        gu_pdf_data = translated_gu_data or prepare_data_for_template(date_questions, "gu")
+        
+        # Check if translation API key is available
+        gemini_api_key = os.environ.get("GEMINI_API_KEY")
+        if translated_gu_data is not None:
+            logger.info("Using content translated together with other dates")
+        elif not translate:
+            logger.info("Translation disabled for this run; generating Gujarati PDF with English content.")
+            gu_pdf_data["language"] = "gu"
+        elif not gemini_api_key:
+            logger.warning("GEMINI_API_KEY not found. Skipping translation and generating Gujarati PDF with English content.")
+            # Just set the language to Gujarati but keep English content
+            gu_pdf_data["language"] = "gu"
+        else:
+            # Translate content if translation is enabled and API key is available
+            if CONFIG.get('translation_enabled', True):
+                logger.info("Translating content to Gujarati...")
+                try:
+                    # Translate the full content in one efficient batch (the translator's rate limiter paces the requests)
+                    gu_pdf_data = await translate_content(gu_pdf_data, "gu")
+                    
+                except Exception as e:
+                    logger.error(f"Error translating content to Gujarati: {e}")
+                    # Continue with partially translated or untranslated data
+                    logger.warning("Continuing with English content but Gujarati language setting.")
+        
+        # Add QR code and metadata
+        gu_pdf_data.update({"gujarati_qr": qr_codes.get('gujarati_qr', '')})
+        gu_pdf_data['generation_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        gu_pdf_data['source'] = "IndiaBix"  # Adding source attribution
+        gu_output_filename = f"current_affairs_{date}_gu.pdf"
+        
+        try:
+            # Call generate_pdf with the correct parameters
+            gu_output_path = await pdf_generator.generate_pdf(
+                template_name=CONFIG['templates']['base'],
+                data=gu_pdf_data,
+                output_filename=gu_output_filename
+            )
+            
+            if validate_pdf(gu_output_path):
+                logger.info(f"Successfully generated Gujarati PDF: {gu_output_path}")
+                output_files["gu"].append(gu_output_path)
+            else:
+                logger.error(f"Failed to validate Gujarati PDF: {gu_output_path}")
+        except Exception as e:
+            logger.error(f"Error generating Gujarati PDF: {e}")
+
+
+async def generate_gujarati_pdfs(
+    scraper: AsyncDataScraper,
+    gu_pending: Dict[str, List[Dict[str, Any]]],
+    qr_codes: Dict[str, str],
+    pdf_generator: ModernPDFGenerator,
+    output_files: Dict[str, List[str]]
+) -> int:
+    """Translate the Gujarati PDFs of the whole run together and generate them
+    
+    The English content of every date is translated in one phase, so small
+    dates share Gemini requests, and split back per date before rendering.
+    With the translation planner, dates deferred by earlier runs are loaded
+    from the database and planned together with this run's dates; whatever
+    does not fit into today's quota is queued again. Queued dates that are no
+    longer stored, and dates too large for a day's quota, are marked failed.
+    
+    Args:
+        scraper: Scraper whose database holds the questions of queued dates
+        gu_pending: Questions per date scraped in this run
+        qr_codes: QR code image paths keyed by channel
+        pdf_generator: PDF generator instance
+        output_files: Dictionary mapping language codes to generated PDF paths (updated in place)
+        
+    Returns:
+        Number of queued dates from earlier runs that were loaded
+    """
+    queue = get_translation_queue() if TRANSLATION_PLANNER else None
+    loaded = {}
+    if queue is not None:
+        queued = [date for date in await queue.dates() if date not in gu_pending]
+        if queued and scraper.questions_collection is not None:
+            try:
+                loaded = scraper.get_questions_for_dates(queued, raise_errors=True)
+            except Exception as e:
+                # Keep them queued: the database, not the dates, is the problem
+                logger.error(f"Could not load dates queued for translation: {e}")
+            else:
+                logger.info(f"Loaded {len(loaded)} of {len(queued)} dates queued for translation by earlier runs")
+                await queue.fail([date for date in queued if date not in loaded], "no stored questions")
+    pending = {**loaded, **gu_pending}
+    if not pending:
+        return 0
+    
+    gu_data = {date: prepare_data_for_template(date_questions, "gu") for date, date_questions in pending.items()}
+    planner = TranslationPlanner("gu")
+    if queue is not None:
+        accepted, deferred, rejected = await planner.plan(gu_data)
+    else:
+        accepted, deferred, rejected = sorted(gu_data, reverse=True), [], []
+    
+    # Translated in the planner's order, so the dates are packed into the
+    # planned requests and recovery stays within the planned reserve
+    translated = {date: gu_data[date] for date in accepted}
+    logger.info(f"Translating content of {len(translated)} dates to Gujarati...")
+    try:
+        await translate_contents(translated, "gu", max_recovery_requests=planner.recovery_reserve)
+    except Exception as e:
+        logger.error(f"Error translating content to Gujarati: {e}")
+        # Continue with partially translated or untranslated data
+        logger.warning("Continuing with English content but Gujarati language setting.")
+    
+    for date in accepted:
+        await generate_pdfs_for_date(
+            date, pending[date], ["gu"], qr_codes, pdf_generator, output_files,
+            translated_gu_data=translated[date]
+        )
+    
+    if queue is not None:
+        await queue.remove(accepted)
+        await queue.add(deferred)
+        await queue.fail(rejected, "needs more requests than the daily limit")
+        if deferred:
+            logger.warning(f"Deferred Gujarati PDFs to the next run: {', '.join(sorted(deferred))}")
+    return len(loaded)
+
+
 async def process_and_generate_pdfs(
     date: Optional[str] = None,
     month: Optional[str] = None,
@@ -153,7 +345,10 @@ async def process_and_generate_pdfs(
     languages: List[str] = ["en", "gu"],
     github_actions_mode: bool = False,
     only_generate: bool = False,
-    force_process: bool = False
+    force_process: bool = False,
+    use_http_cache: bool = True,
+    use_discovery: bool = True,
+    replay: bool = False
 ) -> Dict[str, List[str]]:
     """Process current affairs data and generate PDFs
     
@@ -165,6 +360,10 @@ async def process_and_generate_pdfs(
         languages: List of languages to generate PDFs for
         github_actions_mode: Whether to run in GitHub Actions mode
         only_generate: Whether to only generate PDFs without scraping
+        force_process: Whether to reprocess URLs that were already processed
+        use_http_cache: Whether to revalidate pages against the on-disk HTTP cache
+        use_discovery: Whether to learn published dates from IndiaBix listing pages
+        replay: Whether to re-extract questions from the local page archive instead of crawling
         
     Returns:
         Dictionary mapping language codes to lists of PDF file paths
@@ -205,27 +404,35 @@ async def process_and_generate_pdfs(
         
         # Initialize scraper with MongoDB connection if available
         mongo_uri = CONFIG.get('mongo_db_uri')
-        if not mongo_uri:
+        if replay:
+            # Replay works from the local archive only: no MongoDB, and no translation,
+            # which would spend Gemini quota and touch the shared translation queue
+            logger.info("Replay mode: re-extracting questions from the page archive (translation disabled)")
+            mongo_uri = None
+        elif not mongo_uri:
             logger.warning("MongoDB URI not provided, using local storage")
         
         # Setup MongoDB connection
-        mongo_data = setup_mongodb_connection(mongo_uri)
+        if mongo_uri:
+            mongo_data = setup_mongodb_connection(mongo_uri)
         
         # Initialize scraper
-        scraper = AsyncDataScraper(mongo_uri)
+        scraper = AsyncDataScraper(mongo_uri, use_http_cache=use_http_cache, use_discovery=use_discovery)
         
-        # Fetch questions based on parameters
+        # Stream questions date by date so rendering for early dates overlaps
+        # with downloading the later ones
         if github_actions_mode:
             logger.info("Running in GitHub Actions mode - fetching all new URLs for current month")
-            questions = await scraper.fetch_all_questions(
+        
+        if replay:
+            question_stream = scraper.iter_archived_questions_by_date(
                 specific_date=date,
                 specific_month=month,
                 date_range=date_range,
-                specific_url=specific_url,
-                force_process=force_process  # Use the provided force_process flag
+                specific_url=specific_url
             )
         else:
-            questions = await scraper.fetch_all_questions(
+            question_stream = scraper.iter_questions_by_date(
                 specific_date=date,
                 specific_month=month,
                 date_range=date_range,
@@ -233,101 +440,42 @@ async def process_and_generate_pdfs(
                 force_process=force_process  # Use the provided force_process flag
             )
         
-        if not questions:
+        # Gujarati PDFs wait for the run-level translation phase when quota is spent on them
+        translate_run = (
+            not replay
+            and "gu" in languages
+            and bool(os.environ.get("GEMINI_API_KEY"))
+            and CONFIG.get('translation_enabled', True)
+        )
+        stream_languages = [lang for lang in languages if lang != "gu"] if translate_run else languages
+        gu_pending = {}
+        
+        dates_found = 0
+        try:
+            async for question_date, date_questions in question_stream:
+                dates_found += 1
+                await generate_pdfs_for_date(
+                    question_date, date_questions, stream_languages, qr_codes, pdf_generator, output_files,
+                    translate=not replay
+                )
+                if translate_run:
+                    gu_pending[question_date] = date_questions
+            
+            if translate_run:
+                dates_found += await generate_gujarati_pdfs(
+                    scraper, gu_pending, qr_codes, pdf_generator, output_files
+                )
+        finally:
+            # Make sure every queued page reaches the database
+            await scraper.close()
+        
+        if not dates_found:
             logger.warning("No questions found!")
             return output_files
         
-        # Group questions by date
-        questions_by_date = {}
-        for question in questions:
-            question_date = question.get('date')
-            if question_date not in questions_by_date:
-                questions_by_date[question_date] = []
-            questions_by_date[question_date].append(question)
-        
-        # Generate PDFs for each date
-        for date, date_questions in questions_by_date.items():
-            logger.info(f"Generating PDFs for date: {date} with {len(date_questions)} questions")
-            
-            # English PDF (if requested)
-            if "en" in languages:
-                logger.info(f"Generating English PDF for date: {date}")
-                
-                # Prepare data for template
-                en_pdf_data = prepare_data_for_template(date_questions, "en")
-                
-                # Add QR code and metadata
-                en_pdf_data.update({"english_qr": qr_codes.get('english_qr', '')})
-                en_pdf_data['generation_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                en_pdf_data['source'] = "IndiaBix"  # Adding source attribution
-                en_output_filename = f"current_affairs_{date}_en.pdf"
-                
-                try:
-                    # Call generate_pdf with the correct parameters
-                    en_output_path = await pdf_generator.generate_pdf(
-                        template_name=CONFIG['templates']['base'],
-                        data=en_pdf_data,
-                        output_filename=en_output_filename
-                    )
-                    
-                    if validate_pdf(en_output_path):
-                        logger.info(f"Successfully generated English PDF: {en_output_path}")
-                        output_files["en"].append(en_output_path)
-                    else:
-                        logger.error(f"Failed to validate English PDF: {en_output_path}")
-                except Exception as e:
-                    logger.error(f"Error generating English PDF: {e}")
-            
-            # Gujarati PDF (if requested)
-            if "gu" in languages:
-                logger.info(f"Generating Gujarati PDF for date: {date}")
-                
-                # Prepare data for template
-                gu_pdf_data = prepare_data_for_template(date_questions, "gu")
-                
-                # Check if translation API key is available
-                gemini_api_key = os.environ.get("GEMINI_API_KEY")
-                if not gemini_api_key:
-                    logger.warning("GEMINI_API_KEY not found. Skipping translation and generating Gujarati PDF with English content.")
-                    # Just set the language to Gujarati but keep English content
-                    gu_pdf_data["language"] = "gu"
-                else:
-                    # Translate content if translation is enabled and API key is available
-                    if CONFIG.get('translation_enabled', True):
-                        logger.info("Translating content to Gujarati...")
-                        try:
-                            # Add a delay before starting translation to ensure API rate limits
-                            await asyncio.sleep(2)
-                            
-                            # Translate the full content in one efficient batch
-                            gu_pdf_data = await translate_content(gu_pdf_data, "gu")
-                            
-                        except Exception as e:
-                            logger.error(f"Error translating content to Gujarati: {e}")
-                            # Continue with partially translated or untranslated data
-                            logger.warning("Continuing with English content but Gujarati language setting.")
-                
-                # Add QR code and metadata
-                gu_pdf_data.update({"gujarati_qr": qr_codes.get('gujarati_qr', '')})
-                gu_pdf_data['generation_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                gu_pdf_data['source'] = "IndiaBix"  # Adding source attribution
-                gu_output_filename = f"current_affairs_{date}_gu.pdf"
-                
-                try:
-                    # Call generate_pdf with the correct parameters
-                    gu_output_path = await pdf_generator.generate_pdf(
-                        template_name=CONFIG['templates']['base'],
-                        data=gu_pdf_data,
-                        output_filename=gu_output_filename
-                    )
-                    
-                    if validate_pdf(gu_output_path):
-                        logger.info(f"Successfully generated Gujarati PDF: {gu_output_path}")
-                        output_files["gu"].append(gu_output_path)
-                    else:
-                        logger.error(f"Failed to validate Gujarati PDF: {gu_output_path}")
-                except Exception as e:
-                    logger.error(f"Error generating Gujarati PDF: {e}")
+        # Dates finish in download order; keep the output (and upload order) chronological
+        for lang in output_files:
+            output_files[lang].sort()
         
         return output_files
     
@@ -456,6 +604,12 @@ def parse_arguments():
                        help='Send generated PDFs to WhatsApp groups')
     parser.add_argument('--force', action='store_true',
                        help='Force processing of already processed URLs')
+    parser.add_argument('--no-http-cache', action='store_true',
+                       help='Disable the on-disk conditional-GET cache for IndiaBix pages')
+    parser.add_argument('--no-discovery', action='store_true',
+                       help='Probe every calendar day instead of reading dates from listing pages')
+    parser.add_argument('--replay', action='store_true',
+                       help='Re-extract questions from the local page archive without network access')
     
     return parser.parse_args()
 
@@ -470,16 +624,27 @@ async def main():
         date_range = (args.date_range[0], args.date_range[1])
     
     # Process and generate PDFs
-    pdf_files = await process_and_generate_pdfs(
-        date=args.date,
-        month=args.month,
-        date_range=date_range,
-        specific_url=args.url,
-        languages=args.languages,
-        github_actions_mode=args.github_actions,
-        only_generate=args.only_generate,
-        force_process=args.force
-    )
+    try:
+        pdf_files = await process_and_generate_pdfs(
+            date=args.date,
+            month=args.month,
+            date_range=date_range,
+            specific_url=args.url,
+            languages=args.languages,
+            github_actions_mode=args.github_actions,
+            only_generate=args.only_generate,
+            force_process=args.force,
+            use_http_cache=not args.no_http_cache,
+            use_discovery=not args.no_discovery,
+            replay=args.replay
+        )
+    finally:
+        # Release the crawler's keep-alive connections and parser workers
+        await close_crawler()
+        shutdown_parse_executor()
+        close_translation_store()
+        close_translation_queue()
+        close_motor_clients()
     
     # Send PDFs to Telegram channels if requested
     if args.send_telegram:
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML extraction backends
+
+Reports pages per second for every backend over a set of saved IndiaBix
+pages and checks that each backend produces the same question dicts as
+the original BeautifulSoup extractor.
+
+Usage:
+    python scripts/benchmark_extractors.py page1.html page2.html ...
+    python scripts/benchmark_extractors.py --archive .page_archive
+"""
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.extractors import EXTRACTORS, get_extractor
+from src.core.page_archive import PageArchive
+
+
+def load_pages(paths):
+    """Load saved pages, deriving the page URL from a YYYY-MM-DD in the file path"""
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        date_match = re.search(r'\d{4}-\d{2}-\d{2}', path)
+        date = date_match.group(0) if date_match else "2000-01-01"
+        pages.append((html, f"https://www.indiabix.com/current-affairs/{date}/"))
+    return pages
+
+
+def load_archive(archive_dir):
+    """Load the latest archived fetch of every page in a page archive"""
+    archive = PageArchive(archive_dir)
+    return [(archive.load(page), page.url) for page in archive.latest()]
+
+
+def benchmark(name, pages, min_seconds):
+    """Run one backend over the corpus repeatedly for at least min_seconds"""
+    extractor = get_extractor(name)
+    rounds = 0
+    started = time.perf_counter()
+    while True:
+        for html, url in pages:
+            extractor.extract(html, url)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return rounds * len(pages) / elapsed
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark HTML extraction backends')
+    parser.add_argument('pages', nargs='*', help='Saved IndiaBix HTML pages')
+    parser.add_argument('--archive', help='Use every page in this page archive as the corpus')
+    parser.add_argument('--seconds', type=float, default=3.0,
+                        help='Minimum run time per backend (default: 3)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.disable(logging.CRITICAL)
+
+    pages = load_pages(args.pages)
+    if args.archive:
+        pages += load_archive(args.archive)
+    if not pages:
+        print("No pages to benchmark")
+        return
+    reference = [get_extractor('bs4').extract(html, url) for html, url in pages]
+
+    print(f"{'backend':<8} {'pages/s':>10} {'speedup':>8}  identical")
+    baseline = None
+    for name in ['bs4'] + [n for n in EXTRACTORS if n != 'bs4']:
+        extractor = get_extractor(name)
+        identical = all(extractor.extract(html, url) == expected
+                        for (html, url), expected in zip(pages, reference))
+        rate = benchmark(name, pages, args.seconds)
+        baseline = baseline or rate
+        print(f"{name:<8} {rate:>10.1f} {rate / baseline:>7.1f}x  {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
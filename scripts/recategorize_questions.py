@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Re-categorize stored questions with the keyword classifier
+
+Questions whose page had no explain-link category were stored as
+"general" by older versions of the scraper, and newer versions mark
+keyword guesses with category_source "keyword". This script classifies
+those questions in batches and reports the changes; with --apply the new
+categories are written back with bulk updates. Categories taken from the
+site's explain link are left alone unless --override-site-categories is
+given.
+
+Usage:
+    python scripts/recategorize_questions.py [--override-site-categories] [--apply]
+"""
+import os
+import sys
+import logging
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pymongo import UpdateOne
+from src.config.settings import CONFIG
+from src.core.classifier import get_classifier
+from src.core.utils import setup_mongodb_connection
+
+BATCH_SIZE = 1000
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Re-categorize stored questions by keyword')
+    parser.add_argument('--override-site-categories', action='store_true',
+                        help='Also replace categories taken from the site\'s explain link with keyword guesses')
+    parser.add_argument('--apply', action='store_true',
+                        help='Write the new categories to MongoDB (default: report only)')
+    return parser.parse_args()
+
+
+def flush(collection, questions, classifier, changes, apply):
+    categories = classifier.classify_batch(question.get('question', '') for question in questions)
+    operations = []
+    for question, category in zip(questions, categories):
+        if category != question.get('category'):
+            changes[(question.get('category'), category)] += 1
+            operations.append(UpdateOne(
+                {"_id": question["_id"]},
+                {"$set": {"category": category, "category_source": "keyword"}}
+            ))
+    if apply and operations:
+        collection.bulk_write(operations, ordered=False)
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=logging.WARNING)
+
+    mongo_data = setup_mongodb_connection(CONFIG.get('mongo_db_uri'))
+    if mongo_data is None:
+        print("MongoDB is not available")
+        return
+    collection = mongo_data["questions"]
+    classifier = get_classifier()
+
+    if args.override_site_categories:
+        query = {}
+    else:
+        # Keyword guesses, and "general" fallbacks stored before category_source existed
+        query = {"$or": [
+            {"category_source": "keyword"},
+            {"category_source": {"$exists": False}, "category": "general"}
+        ]}
+    changes = Counter()
+    batch = []
+    for question in collection.find(query, {"_id": 1, "question": 1, "category": 1}):
+        batch.append(question)
+        if len(batch) >= BATCH_SIZE:
+            flush(collection, batch, classifier, changes, args.apply)
+            batch = []
+    if batch:
+        flush(collection, batch, classifier, changes, args.apply)
+
+    for (old, new), count in changes.most_common():
+        print(f"{old or 'none':<15} -> {new:<15} {count:>6}")
+    print(f"{sum(changes.values())} questions {'updated' if args.apply else 'would change (use --apply to write)'}")
+
+
+if __name__ == "__main__":
+    main()
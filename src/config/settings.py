@@ -99,6 +99,134 @@ TEMPLATES = {
 # Translation settings
 TRANSLATION_ENABLED = True
 
+# Crawler settings for fetching IndiaBix pages
+CRAWLER = {
+    "max_connections": int(os.getenv("CRAWLER_MAX_CONNECTIONS", "16")),
+    "max_per_host": int(os.getenv("CRAWLER_MAX_PER_HOST", "4")),
+    "total_timeout": float(os.getenv("CRAWLER_TOTAL_TIMEOUT", "30")),
+    "connect_timeout": 10,
+    "read_timeout": 20,
+    "keepalive_timeout": 30,
+    "dns_cache_ttl": 300,
+    "verify_ssl": False,
+    # Retry policy: separate budgets for connection errors and retryable HTTP statuses
+    "max_connection_retries": 3,
+    "max_http_retries": 3,
+    "backoff_base": 1.0,
+    "backoff_max": 30.0,
+    "max_retry_after": 60.0,
+    "retry_statuses": [429, 500, 502, 503, 504],
+    # Per-host circuit breaker
+    "breaker_failure_threshold": 5,
+    "breaker_reset_timeout": 60,
+    "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+}
+
+# Scraper settings
+SCRAPER = {
+    # HTML extraction backend: "lxml" (fast) or "bs4" (original html.parser extractor)
+    "extractor": os.getenv("SCRAPER_EXTRACTOR", "lxml"),
+    # Where pages are parsed: "auto" (threads for lxml, processes for bs4),
+    # "process", "thread" or "inline" (on the event loop)
+    "parse_executor": os.getenv("SCRAPER_PARSE_EXECUTOR", "auto"),
+    "parse_workers": int(os.getenv("SCRAPER_PARSE_WORKERS", "0")),
+    # Pages fetched/parsed concurrently while streaming dates to PDF generation
+    "max_pages_in_flight": int(os.getenv("SCRAPER_MAX_PAGES_IN_FLIGHT", "8")),
+    # Re-check schedule for dates that returned no questions: dates up to
+    # recent_days old are probed every run, older ones with an interval that
+    # doubles per empty attempt from base_interval_hours up to max_interval_days
+    "negative_cache": {
+        "enabled": os.getenv("NEGATIVE_CACHE_ENABLED", "true").lower() != "false",
+        "recent_days": 2,
+        "base_interval_hours": 6,
+        "max_interval_days": 14
+    },
+    # Learn which dates exist from the month listing page (and the index page
+    # for the current month) instead of probing every calendar day; months
+    # with fewer than min_month_candidates unprocessed dates are probed directly
+    "discovery": {
+        "enabled": os.getenv("DATE_DISCOVERY_ENABLED", "true").lower() != "false",
+        "index_url": os.getenv("DATE_DISCOVERY_INDEX_URL", "https://www.indiabix.com/current-affairs/"),
+        "month_url_template": os.getenv(
+            "DATE_DISCOVERY_MONTH_URL", "https://www.indiabix.com/current-affairs/{year}-{month:02d}/"
+        ),
+        "recent_days": 2,
+        "min_month_candidates": 4,
+        # A month listing counts as complete only if it links a date of the first week
+        "coverage_days": 7,
+        # Unlisted dates are still probed about once a week
+        "probe_unlisted_days": 7
+    },
+    # Processed dates up to this many days old are re-fetched each run and
+    # re-processed only if the fingerprint of their questions changed
+    "revalidation": {
+        "enabled": os.getenv("CONTENT_REVALIDATION_ENABLED", "true").lower() != "false",
+        "days": int(os.getenv("CONTENT_REVALIDATION_DAYS", "3"))
+    },
+    # Near-duplicate detection against questions stored in the last
+    # lookback_days (MinHash/LSH). mode: "flag" only marks duplicates,
+    # "drop" leaves them out of the PDFs. A duplicate's content is never
+    # replaced by the earlier question's (they can differ in year or answer)
+    "dedup": {
+        "enabled": os.getenv("DEDUP_ENABLED", "true").lower() != "false",
+        "mode": os.getenv("DEDUP_MODE", "flag"),
+        "threshold": float(os.getenv("DEDUP_THRESHOLD", "0.7")),
+        "num_perm": 64,
+        "bands": 16,
+        "lookback_days": int(os.getenv("DEDUP_LOOKBACK_DAYS", "60"))
+    },
+    # Local bitmap index of processed dates; lets runs skip the MongoDB lookup
+    # for candidate URLs that were synced within max_age_hours
+    "url_index": {
+        "enabled": os.getenv("URL_INDEX_ENABLED", "true").lower() != "false",
+        "path": str(BASE_DIR / ".processed_urls.idx"),
+        "max_age_hours": float(os.getenv("URL_INDEX_MAX_AGE_HOURS", "6"))
+    }
+}
+
+# Category keywords for questions without an explain-link category. Keywords
+# match whole words, a trailing * matches any word starting with it, and on
+# equal scores the earlier category wins
+CATEGORY_KEYWORDS = {
+    "science": ["scien*", "discover*", "invent*", "technolog*", "research*", "nasa", "space"],
+    "sports": ["sport*", "cricket*", "football*", "hockey", "tennis", "player*", "tournament*",
+               "championship*", "olympic*"],
+    "politics": ["politic*", "minister*", "government*", "election*", "party", "parties", "president*",
+                 "prime minister", "parliament*"],
+    "economy": ["econom*", "financ*", "market*", "stock*", "trade", "trading", "business*", "gdp",
+                "fiscal", "monetary"],
+    "awards": ["award*", "prize*", "medal*", "honor*", "honour*", "recognition", "winner*", "recipient*"],
+    "defense": ["defense", "defence", "military", "army", "navy", "naval", "air force", "weapon*",
+                "missile*", "security"],
+    "international": ["international", "global*", "world", "un", "united nations", "treaty", "treaties",
+                      "agreement*", "foreign"]
+}
+
+# Checks applied to every Gemini translation before it is cached. Glossary
+# terms (and acronyms, numbers and dates) may stay in Latin script
+TRANSLATION_VALIDATION = {
+    "enabled": os.getenv("TRANSLATION_VALIDATION_ENABLED", "true").lower() != "false",
+    "min_gujarati_ratio": float(os.getenv("TRANSLATION_MIN_GUJARATI_RATIO", "0.5")),
+    "glossary": ["IndiaBix", "Current Adda", "Make in India", "Digital India", "Startup India",
+                 "Skill India", "Swachh Bharat", "Ayushman Bharat", "Chandrayaan", "Gaganyaan",
+                 "Mangalyaan", "Aditya-L1", "COVID-19", "G20", "BRICS", "QUAD", "Twitter", "Google",
+                 "Microsoft", "Facebook", "WhatsApp", "YouTube", "Instagram"]
+}
+
+# On-disk conditional-GET cache for IndiaBix pages
+HTTP_CACHE = {
+    "enabled": os.getenv("HTTP_CACHE_ENABLED", "true").lower() != "false",
+    "dir": str(BASE_DIR / ".http_cache"),
+    "max_bytes": int(os.getenv("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+}
+
+# Compressed archive of raw fetched pages, replayed with `main.py --replay`
+PAGE_ARCHIVE = {
+    "enabled": os.getenv("PAGE_ARCHIVE_ENABLED", "true").lower() != "false",
+    "dir": str(BASE_DIR / ".page_archive"),
+    "compresslevel": 6
+}
+
 # Main configuration dictionary
 CONFIG = {
     "base_dir": str(BASE_DIR),
@@ -119,5 +247,11 @@ CONFIG = {
     "gujarati_channel": GUJARATI_CHANNEL,
     "whatsapp_groups": WHATSAPP_GROUPS,
     "author": AUTHOR,
-    "translation_enabled": TRANSLATION_ENABLED
+    "translation_enabled": TRANSLATION_ENABLED,
+    "scraper": SCRAPER,
+    "crawler": CRAWLER,
+    "http_cache": HTTP_CACHE,
+    "page_archive": PAGE_ARCHIVE,
+    "category_keywords": CATEGORY_KEYWORDS,
+    "translation_validation": TRANSLATION_VALIDATION
 }
\ No newline at end of file
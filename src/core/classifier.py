@@ -0,0 +1,79 @@
+"""
+Keyword-based question categorizer.
+
+All keywords of all categories are compiled into one regular expression
+with one named group per category, so a question is scored against every
+category in a single scan. Keywords match whole words only ("un" no
+longer matches "under"); a trailing `*` matches any word starting with
+the keyword ("politic*" matches "political").
+"""
+import re
+import logging
+from typing import Dict, Iterable, List, Optional
+from src.config.settings import CONFIG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = "general"
+
+
+def _keyword_pattern(keyword: str) -> str:
+    keyword = keyword.strip().lower()
+    if keyword.endswith("*"):
+        return re.escape(keyword[:-1]) + r"\w*"
+    return re.escape(keyword)
+
+
+class KeywordClassifier:
+    """Scores text against every category's keywords in one regex pass"""
+
+    def __init__(self, keywords: Dict[str, List[str]], default: str = DEFAULT_CATEGORY):
+        """
+        Initialize the classifier
+
+        Args:
+            keywords: Keywords per category; on equal scores the earlier category wins
+            default: Category returned when no keyword matches
+        """
+        self.default = default
+        self.categories = [category for category, words in keywords.items() if words]
+        groups = []
+        for index, category in enumerate(self.categories):
+            # Longest keywords first so "prime minister" is preferred over "minister"
+            words = sorted({_keyword_pattern(word) for word in keywords[category] if word.strip()},
+                           key=len, reverse=True)
+            groups.append(f"(?P<c{index}>{'|'.join(words)})")
+        self._pattern = re.compile(rf"\b(?:{'|'.join(groups)})\b", re.IGNORECASE) if groups else None
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Return the number of keyword hits per category (categories without hits omitted)"""
+        counts: Dict[str, int] = {}
+        if not text or self._pattern is None:
+            return counts
+        for match in self._pattern.finditer(text):
+            category = self.categories[int(match.lastgroup[1:])]
+            counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    def classify(self, text: str) -> str:
+        """Return the best scoring category of a text"""
+        counts = self.scores(text)
+        if not counts:
+            return self.default
+        # max() keeps the first of equal scores, so table order breaks ties
+        return max((category for category in self.categories if category in counts), key=counts.get)
+
+    def classify_batch(self, texts: Iterable[str]) -> List[str]:
+        """Classify many texts with the same compiled pattern"""
+        return [self.classify(text) for text in texts]
+
+
+_classifier: Optional[KeywordClassifier] = None
+
+
+def get_classifier() -> KeywordClassifier:
+    """Return the shared classifier built from CONFIG['category_keywords']"""
+    global _classifier
+    if _classifier is None:
+        _classifier = KeywordClassifier(CONFIG.get("category_keywords", {}))
+    return _classifier
@@ -0,0 +1,468 @@
+"""
+HTTP crawler engine used by the scraper.
+
+Owns a single keep-alive aiohttp session per process with per-host
+concurrency limits, request timeouts, compression negotiation and a
+DNS cache, retries transient failures with backoff behind a per-host
+circuit breaker, revalidates pages against an on-disk HTTP cache, and
+records throughput statistics for tuning.
+"""
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Iterable, Mapping
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import aiohttp
+from multidict import CIMultiDict
+from src.config.settings import CONFIG
+from src.core.http_cache import HTTPCache
+
+logger = logging.getLogger(__name__)
+
+# aiohttp only decodes brotli bodies when a brotli binding is installed,
+# so "br" is only advertised when it can actually be handled.
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+class FetchResult:
+    """Result of a single HTTP fetch"""
+
+    def __init__(self, url: str, status: int, body: bytes = b"",
+                 headers: Optional[Mapping[str, str]] = None, encoding: str = "utf-8",
+                 elapsed: float = 0.0, error: Optional[str] = None, attempts: int = 1,
+                 from_cache: bool = False):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = headers if headers is not None else CIMultiDict()
+        self.encoding = encoding
+        self.elapsed = elapsed
+        self.error = error
+        self.attempts = attempts
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the response charset"""
+        if not self.body:
+            return ""
+        try:
+            return self.body.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+class CrawlStats:
+    """Request and byte counters used to report crawler throughput"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+    def record(self, nbytes: int = 0, error: bool = False):
+        self.finished_at = time.monotonic()
+        self.requests += 1
+        self.bytes += nbytes
+        if error:
+            self.errors += 1
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return max(self.finished_at - self.started_at, 1e-6)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.elapsed if self.requests else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.requests else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.requests} requests ({self.errors} errors, {self.cache_hits} not modified), "
+                f"{self.bytes / 1024:.1f} KB in {self.elapsed:.2f}s - "
+                f"{self.requests_per_second:.2f} req/s, "
+                f"{self.bytes_per_second / 1024:.1f} KB/s")
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Connection errors (no response at all) and retryable HTTP statuses have
+    separate attempt budgets, and a server-sent Retry-After is honoured up to
+    a cap so a long back-off cannot eat the whole CI time budget.
+    """
+
+    def __init__(self, max_connection_retries: int = 3, max_http_retries: int = 3,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 max_retry_after: float = 60.0,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        self.max_connection_retries = max_connection_retries
+        self.max_http_retries = max_http_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        return cls(
+            max_connection_retries=int(config.get("max_connection_retries", 3)),
+            max_http_retries=int(config.get("max_http_retries", 3)),
+            backoff_base=float(config.get("backoff_base", 1.0)),
+            backoff_max=float(config.get("backoff_max", 30.0)),
+            max_retry_after=float(config.get("max_retry_after", 60.0)),
+            retry_statuses=config.get("retry_statuses", (429, 500, 502, 503, 504)),
+        )
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests to that host fail fast for `reset_timeout` seconds. After that a
+    single probe request is let through; success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+
+    def state(self, host: str) -> str:
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self, host: str) -> bool:
+        state = self.state(host)
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing.get(host):
+            self._probing[host] = True
+            return True
+        return False
+
+    def record_success(self, host: str):
+        if host in self._opened_at:
+            logger.info(f"Circuit for {host} closed again")
+        self._failures.pop(host, None)
+        self._opened_at.pop(host, None)
+        self._probing.pop(host, None)
+
+    def record_failure(self, host: str):
+        failures = self._failures.get(host, 0) + 1
+        self._failures[host] = failures
+        was_probing = self._probing.pop(host, False)
+        if was_probing or failures >= self.failure_threshold:
+            if was_probing or host not in self._opened_at:
+                logger.warning(f"Circuit for {host} opened after {failures} consecutive failures; "
+                               f"pausing requests for {self.reset_timeout:.0f}s")
+            self._opened_at[host] = time.monotonic()
+
+
+class AsyncCrawler:
+    """
+    Shared HTTP client for IndiaBix pages.
+
+    The underlying session is created lazily and reused for every fetch made
+    from the same event loop, so connections stay alive across scraper runs.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, http_cache: Optional[HTTPCache] = None):
+        """
+        Initialize the crawler
+
+        Args:
+            config: Crawler settings (defaults to CONFIG['crawler'])
+            http_cache: Conditional-GET cache (defaults to one built from CONFIG['http_cache'])
+        """
+        self.config = dict(CONFIG.get("crawler", {}))
+        if config:
+            self.config.update(config)
+
+        if http_cache is None:
+            cache_config = CONFIG.get("http_cache", {})
+            if cache_config.get("enabled", True) and cache_config.get("dir"):
+                http_cache = HTTPCache(cache_config["dir"], int(cache_config.get("max_bytes", 200 * 1024 * 1024)))
+        self.http_cache = http_cache
+
+        self.max_per_host = max(1, int(self.config.get("max_per_host", 4)))
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(self.config.get("breaker_failure_threshold", 5)),
+            reset_timeout=float(self.config.get("breaker_reset_timeout", 60)),
+        )
+        self.stats = CrawlStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _build_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            ssl=None if self.config.get("verify_ssl", False) else False,
+            limit=int(self.config.get("max_connections", 16)),
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=float(self.config.get("keepalive_timeout", 30)),
+            use_dns_cache=True,
+            ttl_dns_cache=int(self.config.get("dns_cache_ttl", 300)),
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=float(self.config.get("total_timeout", 30)),
+            connect=float(self.config.get("connect_timeout", 10)),
+            sock_read=float(self.config.get("read_timeout", 20)),
+        )
+        headers = {
+            "User-Agent": self.config.get("user_agent", "Mozilla/5.0"),
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the keep-alive session, recreating it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            await self._discard_session()
+            self._session = self._build_session()
+            self._loop = loop
+            self._host_semaphores = {}
+        return self._session
+
+    async def _discard_session(self):
+        """Release the session of a previous event loop before it is replaced"""
+        session, loop = self._session, self._loop
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Its loop still runs in another thread, so close the session there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # Nothing can be awaited on an idle or closed loop: detach the connector so the
+        # session is not reported unclosed, and shut down its pooled connections here
+        logger.debug("Event loop changed, detaching previous crawler session")
+        connector = session.connector
+        session.detach()
+        if connector is not None and not connector.closed:
+            try:
+                await connector.close()
+            except RuntimeError:
+                # The connector is closed; only waiting for its old loop's transports failed
+                pass
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    use_cache: bool = True) -> FetchResult:
+        """
+        Fetch a URL, revalidating against the HTTP cache when an entry exists
+
+        Args:
+            url: URL to fetch
+            headers: Optional extra request headers
+            use_cache: Whether to send conditional requests and store validated responses
+
+        Returns:
+            FetchResult; a 304 is returned as a 200 with the cached body and from_cache set
+        """
+        cache = self.http_cache if use_cache else None
+        entry = cache.get(url) if cache is not None else None
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        result = await self._fetch_with_retries(url, request_headers or None)
+        if cache is None:
+            return result
+
+        if result.status == 304 and entry is not None:
+            self.stats.cache_hits += 1
+            return FetchResult(
+                url=url,
+                status=200,
+                body=entry.body,
+                headers=result.headers,
+                encoding=entry.encoding,
+                elapsed=result.elapsed,
+                attempts=result.attempts,
+                from_cache=True,
+            )
+
+        if result.ok and result.body:
+            cache.set(url, result.body, result.headers, result.encoding)
+        return result
+
+    async def _fetch_with_retries(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        Fetch a URL, retrying transient failures according to the retry policy
+
+        Args:
+            url: URL to fetch
+            headers: Optional extra request headers
+
+        Returns:
+            FetchResult of the last attempt (status 0 when no response was received)
+        """
+        host = urlsplit(url).netloc
+        policy = self.retry_policy
+        connection_failures = 0
+        http_failures = 0
+        attempts = 0
+
+        while True:
+            if not self.breaker.allow_request(host):
+                logger.warning(f"Circuit open for {host}, skipping {url}")
+                return FetchResult(url=url, status=0, error="circuit open", attempts=attempts)
+
+            attempts += 1
+            result = await self._fetch_once(url, headers)
+            result.attempts = attempts
+
+            if result.status == 0:
+                self.breaker.record_failure(host)
+                connection_failures += 1
+                if connection_failures > policy.max_connection_retries:
+                    return result
+                delay = policy.backoff(connection_failures)
+            elif policy.is_retryable_status(result.status):
+                self.breaker.record_failure(host)
+                http_failures += 1
+                if http_failures > policy.max_http_retries:
+                    return result
+                retry_after = policy.parse_retry_after(result.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > policy.max_retry_after:
+                    logger.warning(f"Retry-After of {retry_after:.0f}s for {url} exceeds limit, giving up")
+                    return result
+                delay = retry_after if retry_after is not None else policy.backoff(http_failures)
+            else:
+                self.breaker.record_success(host)
+                return result
+
+            logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempts + 1}, "
+                        f"last status: {result.status or result.error})")
+            await asyncio.sleep(delay)
+
+    async def _fetch_once(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """Single request, waiting for a free per-host slot first"""
+        session = await self.get_session()
+        # Queue on the semaphore rather than the connector pool so waiting
+        # for a slot does not count against the request timeout.
+        async with self._host_semaphore(url):
+            started = time.monotonic()
+            self.stats.start()
+            try:
+                async with session.get(url, headers=headers) as response:
+                    body = await response.read()
+                    result = FetchResult(
+                        url=url,
+                        status=response.status,
+                        body=body,
+                        headers=CIMultiDict(response.headers),
+                        encoding=response.get_encoding() if body else "utf-8",
+                        elapsed=time.monotonic() - started,
+                    )
+                self.stats.record(len(body), error=result.status >= 400)
+                return result
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats.record(error=True)
+                logger.error(f"Error fetching URL {url}: {e!r}")
+                return FetchResult(url=url, status=0, elapsed=time.monotonic() - started, error=repr(e))
+
+    def log_stats(self):
+        """Log throughput statistics for the requests made so far"""
+        if self.stats.requests:
+            logger.info(f"Crawler stats: {self.stats.summary()}")
+
+    async def close(self):
+        """Close the keep-alive session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_crawler: Optional[AsyncCrawler] = None
+
+def get_crawler() -> AsyncCrawler:
+    global _crawler
+    if _crawler is None:
+        _crawler = AsyncCrawler()
+    return _crawler
+
+async def close_crawler():
+    """Close the shared crawler session (call once at process shutdown)"""
+    if _crawler is not None:
+        await _crawler.close()
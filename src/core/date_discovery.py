@@ -0,0 +1,170 @@
+"""
+Discovery of published current affairs dates from IndiaBix listing pages.
+
+Instead of probing one URL per calendar day, the month listing page (and
+the current-affairs index for the current month) is fetched once and the
+date links on it decide which candidate dates are fetched. A listing is
+only trusted when it also links the first days of its month; listings that
+could not be read, or look truncated (e.g. a month URL redirected to the
+index, which only shows the latest dates), fall back to per-day probing.
+The most recent dates are always kept because listings can lag behind newly
+published pages, and unlisted dates are still probed every few days in
+case a listing missed them.
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+from src.core.crawler import AsyncCrawler
+from src.core.extractors import DATE_URL_PATTERN, extract_date_from_url, url_age_days
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_URL = "https://www.indiabix.com/current-affairs/"
+DEFAULT_MONTH_URL_TEMPLATE = "https://www.indiabix.com/current-affairs/{year}-{month:02d}/"
+
+
+def extract_listed_dates(html: str) -> Set[str]:
+    """Return every YYYY-MM-DD date linked from a listing page"""
+    return set(DATE_URL_PATTERN.findall(html))
+
+
+class DateDiscovery:
+    """Narrows candidate date URLs down to the dates IndiaBix actually lists"""
+
+    def __init__(self, crawler: AsyncCrawler, index_url: str = DEFAULT_INDEX_URL,
+                 month_url_template: str = DEFAULT_MONTH_URL_TEMPLATE,
+                 recent_days: int = 2, min_month_candidates: int = 4,
+                 coverage_days: int = 7, probe_unlisted_days: int = 7,
+                 use_cache: bool = True):
+        """
+        Initialize date discovery
+
+        Args:
+            crawler: HTTP crawler used for listing pages
+            index_url: Current-affairs index page (lists the latest dates)
+            month_url_template: Month listing URL with {year} and {month} fields
+            recent_days: Dates at most this many days old are always fetched
+            min_month_candidates: Months with fewer candidates are probed directly,
+                                  since a listing fetch would not save anything
+            coverage_days: A month listing is trusted only if it links a date within
+                           this many days of the start of the month
+            probe_unlisted_days: Unlisted dates are still probed about once per this many days
+            use_cache: Whether listing pages go through the HTTP cache
+        """
+        self.crawler = crawler
+        self.index_url = index_url
+        self.month_url_template = month_url_template
+        self.recent_days = recent_days
+        self.min_month_candidates = min_month_candidates
+        self.coverage_days = coverage_days
+        self.probe_unlisted_days = max(1, probe_unlisted_days)
+        self.use_cache = use_cache
+
+    @classmethod
+    def from_config(cls, crawler: AsyncCrawler, config: Dict[str, Any],
+                    use_cache: bool = True) -> "DateDiscovery":
+        return cls(
+            crawler,
+            index_url=config.get("index_url", DEFAULT_INDEX_URL),
+            month_url_template=config.get("month_url_template", DEFAULT_MONTH_URL_TEMPLATE),
+            recent_days=int(config.get("recent_days", 2)),
+            min_month_candidates=int(config.get("min_month_candidates", 4)),
+            coverage_days=int(config.get("coverage_days", 7)),
+            probe_unlisted_days=int(config.get("probe_unlisted_days", 7)),
+            use_cache=use_cache,
+        )
+
+    def month_url(self, year: int, month: int) -> str:
+        return self.month_url_template.format(year=year, month=month)
+
+    def covers_month(self, year: int, month: int, dates: Set[str], now: datetime) -> bool:
+        """Whether a listing's dates reach back to the start of their month"""
+        if int(min(dates)[8:10]) <= self.coverage_days:
+            return True
+        # Early in the current month there is nothing older to list yet
+        return (year, month) == (now.year, now.month) and now.day <= self.coverage_days
+
+    def _probe_due(self, date_str: str, now: datetime) -> bool:
+        """Whether an unlisted date is due for its occasional probe (spread over the days)"""
+        day = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+        return (now.toordinal() + day.toordinal()) % self.probe_unlisted_days == 0
+
+    async def _fetch_listed_dates(self, url: str) -> Optional[Set[str]]:
+        """Fetch a listing page and return its linked dates, or None if it failed"""
+        try:
+            result = await self.crawler.fetch(url, use_cache=self.use_cache)
+        except Exception as e:
+            logger.warning(f"Error fetching listing page {url}: {e}")
+            return None
+        if not result.ok:
+            logger.warning(f"Listing page {url} unavailable (status {result.status})")
+            return None
+        return extract_listed_dates(result.text)
+
+    async def filter_candidates(self, candidate_urls: List[str],
+                                now: Optional[datetime] = None) -> List[str]:
+        """
+        Keep only the candidate URLs whose dates are listed by IndiaBix
+
+        Args:
+            candidate_urls: Date URLs that would otherwise be probed one by one
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            Candidate URLs worth fetching, in their original order
+        """
+        now = now or datetime.now()
+        by_month: Dict[Tuple[int, int], List[str]] = {}
+        for url in candidate_urls:
+            date_str = extract_date_from_url(url)
+            if date_str:
+                by_month.setdefault((int(date_str[:4]), int(date_str[5:7])), []).append(url)
+
+        months = [key for key, urls in by_month.items() if len(urls) >= self.min_month_candidates]
+        if not months:
+            return candidate_urls
+
+        listing_urls = [self.month_url(year, month) for year, month in months]
+        if (now.year, now.month) in months:
+            # The month page may not be updated yet; the index lists the latest dates
+            listing_urls.append(self.index_url)
+        results = await asyncio.gather(*(self._fetch_listed_dates(url) for url in listing_urls))
+
+        index_dates = results[len(months)] if len(results) > len(months) else None
+        listed: Dict[Tuple[int, int], Set[str]] = {}
+        for (year, month), month_dates in zip(months, results):
+            prefix = f"{year}-{month:02d}-"
+            dates = {d for d in month_dates or () if d.startswith(prefix)}
+            if not dates:
+                logger.info(f"No dates listed for {year}-{month:02d}; probing every day of the month")
+                continue
+            if not self.covers_month(year, month, dates, now):
+                logger.warning(f"Listing of {year}-{month:02d} starts at {min(dates)} and looks incomplete; "
+                               f"probing every day of the month")
+                continue
+            listed[(year, month)] = dates | {d for d in index_dates or () if d.startswith(prefix)}
+
+        kept = []
+        skipped = []
+        for url in candidate_urls:
+            date_str = extract_date_from_url(url)
+            if not date_str:
+                kept.append(url)
+                continue
+            dates = listed.get((int(date_str[:4]), int(date_str[5:7])))
+            if dates is None or date_str in dates:
+                kept.append(url)
+                continue
+            age_days = url_age_days(url, now)
+            if (age_days is not None and age_days <= self.recent_days) or self._probe_due(date_str, now):
+                kept.append(url)
+            else:
+                skipped.append(date_str)
+
+        if skipped:
+            logger.info(f"Date discovery: skipping {len(skipped)} unlisted dates until their next probe: "
+                        f"{', '.join(skipped)}")
+        logger.info(f"Date discovery: {len(kept)} of {len(candidate_urls)} candidate dates kept "
+                    f"({len(listing_urls)} listing pages fetched)")
+        return kept
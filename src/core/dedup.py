@@ -0,0 +1,130 @@
+"""
+Near-duplicate detection for questions repeated across dates.
+
+Each question is reduced to a MinHash signature over word-bigram
+shingles of its text and options. Signatures are split into LSH bands so
+a lookup only compares against questions sharing at least one band,
+which keeps checks fast against thousands of historical questions; the
+candidates are then confirmed by their estimated Jaccard similarity.
+"""
+import re
+import zlib
+import random
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+Signature = Tuple[int, ...]
+
+
+def question_text(question: Dict[str, Any]) -> str:
+    """Text of a question used for similarity: the question followed by its options"""
+    options = question.get("options") or []
+    if isinstance(options, dict):
+        options = list(options.values())
+    return " ".join([question.get("question", "")] + [str(option) for option in options])
+
+
+def shingles(text: str) -> List[int]:
+    """Hash the word bigrams of lower-cased text (single words for one-word texts)"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < 2:
+        grams = tokens
+    else:
+        grams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return list({zlib.crc32(gram.encode("utf-8")) for gram in grams})
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of questions keyed by question id"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """
+        Initialize the index
+
+        Args:
+            threshold: Estimated Jaccard similarity at which questions count as duplicates
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; must divide num_perm
+            seed: Seed for the permutation coefficients, fixed so signatures are stable
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Signature, List[str]]] = [{} for _ in range(bands)]
+        self._entries: Dict[str, Tuple[str, Signature, Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def signature(self, text: str) -> Signature:
+        """MinHash signature of a text"""
+        hashes = shingles(text)
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def _bands(self, signature: Signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: str, date: str, signature: Signature, payload: Optional[Dict[str, Any]] = None):
+        """
+        Add a question to the index
+
+        Args:
+            key: Question id
+            date: Question date (YYYY-MM-DD)
+            signature: MinHash signature of the question
+            payload: Data returned with matches (e.g. the stored question text)
+        """
+        if key in self._entries:
+            return
+        self._entries[key] = (date, signature, payload or {})
+        for band, band_key in self._bands(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: Signature, before_date: Optional[str] = None) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Find the most similar indexed question
+
+        Args:
+            signature: MinHash signature to look up
+            before_date: Only match questions from dates strictly before this one
+
+        Returns:
+            Tuple of (key, estimated similarity, payload) for the best match at or
+            above the threshold, or None
+        """
+        candidates = set()
+        for band, band_key in self._bands(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            date, other, payload = self._entries[key]
+            if before_date is not None and not date < before_date:
+                continue
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity, payload)
+        return best
@@ -0,0 +1,445 @@
+"""
+HTML extraction backends for IndiaBix current affairs pages.
+
+Every backend turns a page into the same list of question dicts. The
+BeautifulSoup backend is the original extractor; the lxml backend parses
+only the region holding the question blocks and reads text nodes
+directly instead of re-serialising elements and stripping tags.
+"""
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from lxml import etree
+from src.core.classifier import get_classifier
+
+logger = logging.getLogger(__name__)
+
+DATE_URL_PATTERN = re.compile(r'/current-affairs/(\d{4}-\d{2}-\d{2})/')
+FINGERPRINT_FIELDS = ("question", "options", "correct_answer", "explanation", "category")
+CATEGORY_PATTERN = re.compile(r'Category\s*:\s*([^<]+)')
+_TAG_PATTERN = re.compile(r'<[^>]*>')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def clean_html_text(text: str) -> str:
+    """
+    Clean HTML text by removing extra whitespace and HTML tags
+
+    Args:
+        text: HTML text to clean
+
+    Returns:
+        Cleaned text
+    """
+    # Remove HTML tags
+    text = _TAG_PATTERN.sub('', text)
+
+    # Remove extra whitespace
+    text = _WHITESPACE_PATTERN.sub(' ', text)
+
+    # Remove leading/trailing whitespace
+    return text.strip()
+
+
+def determine_difficulty(explanation: str, question: str) -> str:
+    """
+    Determine the difficulty of a question based on its explanation and content
+
+    Args:
+        explanation: Question explanation
+        question: Question text
+
+    Returns:
+        Difficulty level: easy, medium, or hard
+    """
+    # Determine difficulty based on explanation length and complexity
+    if len(explanation) < 100:
+        return "easy"
+    elif len(explanation) < 300:
+        return "medium"
+    else:
+        return "hard"
+
+
+def extract_date_from_url(url: str) -> Optional[str]:
+    """Return the YYYY-MM-DD date embedded in a current affairs URL"""
+    date_match = DATE_URL_PATTERN.search(url)
+    return date_match.group(1) if date_match else None
+
+
+def url_age_days(url: str, now: Optional[datetime] = None) -> Optional[int]:
+    """Return how many days before `now` the date in a current affairs URL lies"""
+    date_str = extract_date_from_url(url)
+    if not date_str:
+        return None
+    try:
+        page_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    return ((now or datetime.now()).date() - page_date).days
+
+
+def fingerprint_questions(questions: Iterable[Dict[str, Any]]) -> str:
+    """
+    Fingerprint a page by its normalized question blocks
+
+    Only the extracted question fields are hashed, so changes to page chrome,
+    ads or markup do not count as a content change.
+
+    Args:
+        questions: Questions extracted from one page, in page order
+
+    Returns:
+        Hex SHA-256 of the question content
+    """
+    digest = hashlib.sha256()
+    for question in questions:
+        fields = [question.get(field) for field in FINGERPRINT_FIELDS]
+        digest.update(json.dumps(fields, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class BaseExtractor:
+    """Common driver shared by all extraction backends"""
+
+    name = "base"
+
+    def extract(self, html_content: str, url: str) -> List[Dict[str, Any]]:
+        """
+        Extract question data from HTML content
+
+        Args:
+            html_content: HTML content
+            url: URL of the page
+
+        Returns:
+            List of extracted questions
+        """
+        if not html_content:
+            return []
+
+        try:
+            # Extract date from URL
+            date = extract_date_from_url(url)
+            if not date:
+                logger.error(f"Could not extract date from URL: {url}")
+                return []
+
+            blocks = self._question_blocks(html_content)
+            if not blocks:
+                logger.warning(f"No question blocks found for URL: {url}")
+                return []
+
+            logger.info(f"Found {len(blocks)} questions for date: {date}")
+
+            questions_data = []
+            for i, block in enumerate(blocks, 1):
+                try:
+                    fields = self._block_fields(block)
+                    if fields is None:
+                        continue
+                    questions_data.append(self._build_question(fields, date, i, url))
+                except Exception as e:
+                    logger.error(f"Error extracting question data: {e}")
+                    continue
+
+            # Blocks without an explain-link category are classified by keyword
+            uncategorized = [question for question in questions_data if question["category"] is None]
+            if uncategorized:
+                categories = get_classifier().classify_batch(question["question"] for question in uncategorized)
+                for question, category in zip(uncategorized, categories):
+                    question["category"] = category
+                    question["category_source"] = "keyword"
+
+            logger.info(f"Extracted {len(questions_data)} questions from URL: {url}")
+            return questions_data
+
+        except Exception as e:
+            logger.error(f"Error parsing HTML content: {e}")
+            return []
+
+    def _question_blocks(self, html_content: str) -> List[Any]:
+        raise NotImplementedError
+
+    def _block_fields(self, block: Any) -> Optional[Dict[str, Any]]:
+        """Return question, options, correct_answer, explanation and raw category text for a block"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _build_question(fields: Dict[str, Any], date: str, index: int, url: str) -> Dict[str, Any]:
+        category = None
+        category_text = fields.get("category_text")
+        if category_text:
+            category_match = CATEGORY_PATTERN.search(category_text)
+            if category_match:
+                category = category_match.group(1).strip().lower()
+
+        explanation = fields["explanation"]
+        question_text = fields["question"]
+
+        return {
+            "id": f"{date}-{index}",
+            "date": date,
+            "question": question_text,
+            "options": fields["options"],
+            "correct_answer": fields["correct_answer"],
+            "explanation": explanation,
+            "difficulty": determine_difficulty(explanation, question_text),
+            "category": category,
+            # "site" for explain-link categories; keyword guesses are marked "keyword"
+            "category_source": "site" if category else None,
+            "url": url
+        }
+
+
+class BeautifulSoupExtractor(BaseExtractor):
+    """Original extractor built on BeautifulSoup's pure-Python html.parser"""
+
+    name = "bs4"
+
+    def _question_blocks(self, html_content: str) -> List[Any]:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        return soup.find_all('div', class_='bix-div-container')
+
+    def _block_fields(self, block: Any) -> Optional[Dict[str, Any]]:
+        question_element = block.find('div', class_='bix-td-qtxt')
+        if not question_element:
+            return None
+
+        options = []
+        options_element = block.find('div', class_='bix-tbl-options')
+        if options_element:
+            for option_row in options_element.find_all('div', class_='bix-opt-row'):
+                option_value = option_row.find('div', class_='bix-td-option-val')
+                if option_value:
+                    options.append(clean_html_text(str(option_value)))
+
+        correct_answer = ""
+        hidden_answer = block.find('input', {'id': lambda x: x and x.startswith('hdnAnswer_')})
+        if hidden_answer and 'value' in hidden_answer.attrs:
+            correct_answer = hidden_answer['value']
+
+        explanation = ""
+        explanation_element = block.find('div', class_='bix-ans-description')
+        if explanation_element:
+            explanation = clean_html_text(str(explanation_element))
+
+        category_element = block.find('div', class_='explain-link')
+
+        return {
+            "question": clean_html_text(str(question_element)),
+            "options": options,
+            "correct_answer": correct_answer,
+            "explanation": explanation,
+            "category_text": clean_html_text(str(category_element)) if category_element else None,
+        }
+
+
+def _class_xpath(tag: str, css_class: str, first: bool = True) -> etree.XPath:
+    """Compiled XPath matching descendants whose class list contains css_class"""
+    expression = f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+    if first:
+        expression = f"({expression})[1]"
+    return etree.XPath(expression)
+
+
+class LxmlExtractor(BaseExtractor):
+    """
+    libxml2-based extractor.
+
+    Parsing starts at the first question block outside scripts, styles and
+    comments, so the page header, navigation and scripts before it are never
+    tokenised. Text is read from
+    the text nodes and only re-escaped where the original serialise-and-strip
+    pipeline would have produced entities, keeping output identical.
+    """
+
+    name = "lxml"
+
+    # Script, style and comment bodies are skipped: markup quoted inside them
+    # must not be taken for the first question block
+    _BLOCK_START = re.compile(
+        r'(?is:<(script|style)\b.*?</\1\s*>|<!--.*?-->)'
+        r'|(?P<start><div\b[^>]*\bbix-div-container\b)'
+    )
+    _BLOCKS = _class_xpath('div', 'bix-div-container', first=False)
+    _QUESTION = _class_xpath('div', 'bix-td-qtxt')
+    _OPTIONS = _class_xpath('div', 'bix-tbl-options')
+    _OPTION_ROWS = _class_xpath('div', 'bix-opt-row', first=False)
+    _OPTION_VALUE = _class_xpath('div', 'bix-td-option-val')
+    _ANSWER = etree.XPath(".//input[starts-with(@id, 'hdnAnswer_')][1]")
+    _EXPLANATION = _class_xpath('div', 'bix-ans-description')
+    _CATEGORY = _class_xpath('div', 'explain-link')
+
+    def __init__(self):
+        self._parser = etree.HTMLParser(remove_comments=True, remove_pis=True, no_network=True)
+
+    def _question_blocks(self, html_content: str) -> List[Any]:
+        start = next(
+            (match.start('start') for match in self._BLOCK_START.finditer(html_content) if match.group('start')),
+            None
+        )
+        if start is None:
+            return []
+        root = etree.fromstring(html_content[start:], self._parser)
+        if root is None:
+            return []
+        return self._BLOCKS(root)
+
+    @staticmethod
+    def _text(element: Any) -> str:
+        # Equivalent to clean_html_text(str(bs4_element)): bs4 re-escapes
+        # &, < and > when serialising, and the tag-stripping regex keeps them.
+        text = "".join(element.itertext())
+        if "&" in text or "<" in text or ">" in text:
+            text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+    @classmethod
+    def _first(cls, xpath: etree.XPath, element: Any) -> Optional[Any]:
+        found = xpath(element)
+        return found[0] if found else None
+
+    def _block_fields(self, block: Any) -> Optional[Dict[str, Any]]:
+        question_element = self._first(self._QUESTION, block)
+        if question_element is None:
+            return None
+
+        options = []
+        options_element = self._first(self._OPTIONS, block)
+        if options_element is not None:
+            for option_row in self._OPTION_ROWS(options_element):
+                option_value = self._first(self._OPTION_VALUE, option_row)
+                if option_value is not None:
+                    options.append(self._text(option_value))
+
+        correct_answer = ""
+        hidden_answer = self._first(self._ANSWER, block)
+        if hidden_answer is not None and 'value' in hidden_answer.attrib:
+            correct_answer = hidden_answer.get('value')
+
+        explanation = ""
+        explanation_element = self._first(self._EXPLANATION, block)
+        if explanation_element is not None:
+            explanation = self._text(explanation_element)
+
+        category_element = self._first(self._CATEGORY, block)
+
+        return {
+            "question": self._text(question_element),
+            "options": options,
+            "correct_answer": correct_answer,
+            "explanation": explanation,
+            "category_text": self._text(category_element) if category_element is not None else None,
+        }
+
+
+EXTRACTORS = {
+    LxmlExtractor.name: LxmlExtractor,
+    BeautifulSoupExtractor.name: BeautifulSoupExtractor,
+}
+
+DEFAULT_EXTRACTOR = LxmlExtractor.name
+
+
+def get_extractor(name: Optional[str] = None) -> BaseExtractor:
+    """
+    Create an extraction backend by name
+
+    Args:
+        name: Backend name ("lxml" or "bs4"); defaults to the fast lxml backend
+
+    Returns:
+        Extractor instance
+    """
+    name = (name or DEFAULT_EXTRACTOR).lower()
+    extractor_class = EXTRACTORS.get(name)
+    if extractor_class is None:
+        logger.warning(f"Unknown extractor backend '{name}', using {DEFAULT_EXTRACTOR}")
+        extractor_class = EXTRACTORS[DEFAULT_EXTRACTOR]
+    return extractor_class()
+
+
+# Extractors used by parse_page, one per backend and per worker thread/process
+# (lxml parser objects must not be shared between threads)
+_worker_state = threading.local()
+
+def parse_page(html_content: str, url: str, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Extract questions from a page; picklable entry point for executor workers
+
+    Args:
+        html_content: HTML content
+        url: URL of the page
+        backend: Extraction backend name
+
+    Returns:
+        List of extracted questions as plain dicts
+    """
+    name = backend or DEFAULT_EXTRACTOR
+    extractors = getattr(_worker_state, "extractors", None)
+    if extractors is None:
+        extractors = _worker_state.extractors = {}
+    extractor = extractors.get(name)
+    if extractor is None:
+        extractor = extractors[name] = get_extractor(name)
+    return extractor.extract(html_content, url)
+
+
+# Backends whose parser releases the GIL, so threads give real parallelism
+GIL_RELEASING_BACKENDS = {LxmlExtractor.name}
+
+_parse_executor: Optional[Executor] = None
+_parse_executor_key: Optional[Tuple[str, int]] = None
+
+def get_parse_executor(mode: str = "auto", workers: int = 0,
+                       backend: Optional[str] = None) -> Optional[Executor]:
+    """
+    Return the shared executor used to parse pages off the event loop
+
+    Args:
+        mode: "process", "thread", "inline" (no executor) or "auto", which picks
+              threads for GIL-releasing backends and processes otherwise
+        workers: Worker count (0 means one per CPU)
+        backend: Extraction backend name, used by "auto"
+
+    Returns:
+        Executor, or None when parsing should run inline
+    """
+    global _parse_executor, _parse_executor_key
+
+    mode = (mode or "auto").lower()
+    if mode == "auto":
+        mode = "thread" if (backend or DEFAULT_EXTRACTOR) in GIL_RELEASING_BACKENDS else "process"
+    if mode == "inline":
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    key = (mode, workers)
+    if _parse_executor is not None and _parse_executor_key == key:
+        return _parse_executor
+
+    shutdown_parse_executor()
+    if mode == "process":
+        _parse_executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        _parse_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parser")
+    _parse_executor_key = key
+    logger.info(f"Parsing pages with a {mode} pool of {workers} workers")
+    return _parse_executor
+
+def shutdown_parse_executor():
+    """Shut down the shared parse executor (call once at process shutdown)"""
+    global _parse_executor, _parse_executor_key
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=True)
+    _parse_executor = None
+    _parse_executor_key = None
@@ -0,0 +1,187 @@
+"""
+On-disk HTTP cache for conditional GET requests.
+
+Each URL is stored as a small JSON metadata file (validators and charset)
+next to a gzip-compressed body. Later fetches send If-None-Match /
+If-Modified-Since and a 304 response is served from disk. The cache is
+bounded by total size and evicts the least recently used entries.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    """A cached response: validators plus the decoded body bytes"""
+
+    def __init__(self, url: str, body: bytes, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, encoding: str = "utf-8",
+                 stored_at: float = 0.0):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.encoding = encoding
+        self.stored_at = stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """Size-bounded on-disk cache keyed by URL"""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 200 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total on-disk size above which old entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes: Optional[int] = None
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body.gz"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a URL, or None"""
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable HTTP cache entry for {url}: {e}")
+            self.delete(url)
+            return None
+
+        # Touch the metadata file so eviction follows last use, not insertion
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        return CacheEntry(
+            url=url,
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            encoding=meta.get("encoding", "utf-8"),
+            stored_at=meta.get("stored_at", 0.0),
+        )
+
+    def set(self, url: str, body: bytes, headers: Mapping[str, str], encoding: str = "utf-8") -> bool:
+        """
+        Store a response if it carries a validator
+
+        Args:
+            url: Request URL
+            body: Decoded response body
+            headers: Response headers
+            encoding: Response charset
+
+        Returns:
+            True if the response was stored
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+
+        meta_path, body_path = self._paths(url)
+        previous_size = self._entry_size(meta_path, body_path)
+        try:
+            with gzip.open(body_path, "wb", compresslevel=6) as f:
+                f.write(body)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "encoding": encoding,
+                    "stored_at": time.time(),
+                }, f)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {url}: {e}")
+            return False
+
+        if self._total_bytes is not None:
+            self._total_bytes += self._entry_size(meta_path, body_path) - previous_size
+        self._evict()
+        return True
+
+    def delete(self, url: str):
+        meta_path, body_path = self._paths(url)
+        size = self._entry_size(meta_path, body_path)
+        for path in (meta_path, body_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+
+    @staticmethod
+    def _entry_size(meta_path: Path, body_path: Path) -> int:
+        size = 0
+        for path in (meta_path, body_path):
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return size
+
+    def total_bytes(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(p.stat().st_size for p in self.cache_dir.iterdir() if p.is_file())
+        return self._total_bytes
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if self.total_bytes() <= self.max_bytes:
+            return
+
+        entries = []
+        for meta_path in self.cache_dir.glob("*.json"):
+            body_path = meta_path.with_name(meta_path.stem + ".body.gz")
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path, body_path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+
+        evicted = 0
+        for _, meta_path, body_path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = self._entry_size(meta_path, body_path)
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._total_bytes -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} HTTP cache entries to stay under {self.max_bytes / (1024 * 1024):.0f} MB")
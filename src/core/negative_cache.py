@@ -0,0 +1,78 @@
+"""
+Re-check schedule for dates that returned no questions.
+
+Empty results are recorded in `scraped_urls` with `has_data: False`,
+the last HTTP status, the time of the last check and the number of
+attempts. Today's and other recent dates are probed on every run; older
+empty dates are probed with an exponentially growing interval so the
+daily cron stops re-fetching dates that will never have content.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from src.core.extractors import url_age_days
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCachePolicy:
+    """Decides whether an empty date is worth fetching again"""
+
+    def __init__(self, recent_days: int = 2, base_interval_hours: float = 6.0,
+                 max_interval_days: float = 14.0):
+        """
+        Initialize the policy
+
+        Args:
+            recent_days: Dates at most this many days old are always re-checked
+            base_interval_hours: Wait after the first empty result for an older date
+            max_interval_days: Upper bound of the re-check interval
+        """
+        self.recent_days = recent_days
+        self.base_interval = timedelta(hours=base_interval_hours)
+        self.max_interval = timedelta(days=max_interval_days)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "NegativeCachePolicy":
+        return cls(
+            recent_days=int(config.get("recent_days", 2)),
+            base_interval_hours=float(config.get("base_interval_hours", 6)),
+            max_interval_days=float(config.get("max_interval_days", 14)),
+        )
+
+    def recheck_interval(self, attempts: int) -> timedelta:
+        """Interval after `attempts` empty results: base * 2^(attempts - 1), capped"""
+        # Double until the cap is reached instead of building 2^attempts, which overflows timedelta
+        interval = self.base_interval
+        for _ in range(max(0, attempts - 1)):
+            if interval >= self.max_interval:
+                break
+            interval *= 2
+        return min(interval, self.max_interval)
+
+    def should_recheck(self, url: str, record: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> bool:
+        """
+        Decide whether to fetch a URL that may have been empty before
+
+        Args:
+            url: Date URL
+            record: Its `scraped_urls` document, if any
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            True if the URL should be fetched on this run
+        """
+        if not record or record.get("has_data"):
+            return True
+
+        last_checked = record.get("last_checked_at")
+        if not isinstance(last_checked, datetime):
+            return True
+
+        now = now or datetime.now()
+        age_days = url_age_days(url, now)
+        if age_days is not None and age_days <= self.recent_days:
+            return True
+
+        attempts = int(record.get("attempts", 1))
+        return now - last_checked >= self.recheck_interval(attempts)
@@ -0,0 +1,176 @@
+"""
+Compressed, content-addressed archive of raw IndiaBix pages.
+
+Page bodies are stored once per distinct content as gzip blobs named by
+their SHA-256 (`objects/ab/<sha256>.html.gz`). An append-only manifest
+(`manifest.jsonl`) records each URL, the time it was fetched and the
+blob holding its body, so extraction can be re-run over the archive
+without touching the network.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from src.config.settings import CONFIG
+from src.core.extractors import extract_date_from_url
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+class ArchivedPage:
+    """One archived fetch of a URL"""
+
+    def __init__(self, url: str, sha256: str, fetched_at: float, encoding: str = "utf-8",
+                 status: int = 200, size: int = 0):
+        self.url = url
+        self.sha256 = sha256
+        self.fetched_at = fetched_at
+        self.encoding = encoding
+        self.status = status
+        self.size = size
+
+    @property
+    def date(self) -> Optional[str]:
+        return extract_date_from_url(self.url)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "url": self.url,
+            "sha256": self.sha256,
+            "fetched_at": self.fetched_at,
+            "encoding": self.encoding,
+            "status": self.status,
+            "size": self.size,
+        }
+
+
+class PageArchive:
+    """Stores page bodies by content hash and indexes them by URL and fetch time"""
+
+    def __init__(self, archive_dir: Union[str, Path], compresslevel: int = 6):
+        """
+        Initialize the archive
+
+        Args:
+            archive_dir: Directory holding the manifest and blobs
+            compresslevel: gzip level for new blobs
+        """
+        self.archive_dir = Path(archive_dir)
+        self.compresslevel = compresslevel
+        self.manifest_path = self.archive_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._latest: Optional[Dict[str, ArchivedPage]] = None
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.archive_dir / "objects" / sha256[:2] / f"{sha256}.html.gz"
+
+    def _load_manifest(self) -> List[ArchivedPage]:
+        pages = []
+        if not self.manifest_path.exists():
+            return pages
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    pages.append(ArchivedPage(**record))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping malformed archive manifest line: {e}")
+        return pages
+
+    def _latest_pages(self) -> Dict[str, ArchivedPage]:
+        if self._latest is None:
+            latest = {}
+            for page in self._load_manifest():
+                current = latest.get(page.url)
+                if current is None or page.fetched_at >= current.fetched_at:
+                    latest[page.url] = page
+            self._latest = latest
+        return self._latest
+
+    def store(self, url: str, body: bytes, encoding: str = "utf-8", status: int = 200,
+              fetched_at: Optional[float] = None) -> Optional[str]:
+        """
+        Archive a fetched page
+
+        Args:
+            url: Page URL
+            body: Raw response body
+            encoding: Response charset
+            status: HTTP status of the fetch
+            fetched_at: Fetch time as a UNIX timestamp (defaults to now)
+
+        Returns:
+            SHA-256 of the body, or None if it could not be archived
+        """
+        sha256 = hashlib.sha256(body).hexdigest()
+        fetched_at = fetched_at or time.time()
+        blob_path = self._blob_path(sha256)
+        with self._lock:
+            try:
+                latest = self._latest_pages().get(url)
+                if latest is not None and latest.sha256 == sha256 and blob_path.exists():
+                    # Unchanged since the last fetch, nothing new to record
+                    return sha256
+
+                if not blob_path.exists():
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = blob_path.with_suffix(".tmp")
+                    with gzip.open(tmp_path, "wb", compresslevel=self.compresslevel) as f:
+                        f.write(body)
+                    os.replace(tmp_path, blob_path)
+
+                page = ArchivedPage(url, sha256, fetched_at, encoding, status, len(body))
+                with open(self.manifest_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(page.to_dict()) + "\n")
+                self._latest[url] = page
+                return sha256
+            except OSError as e:
+                logger.warning(f"Could not archive page {url}: {e}")
+                return None
+
+    def load(self, page: ArchivedPage) -> str:
+        """Return the decoded HTML of an archived page"""
+        with gzip.open(self._blob_path(page.sha256), "rb") as f:
+            body = f.read()
+        return body.decode(page.encoding or "utf-8", errors="replace")
+
+    def latest(self, urls: Optional[Iterable[str]] = None) -> List[ArchivedPage]:
+        """
+        Return the most recent fetch of each archived URL
+
+        Args:
+            urls: Restrict to these URLs (defaults to every archived URL)
+
+        Returns:
+            Archived pages ordered by URL
+        """
+        with self._lock:
+            latest = dict(self._latest_pages())
+        if urls is not None:
+            latest = {url: latest[url] for url in urls if url in latest}
+        return [latest[url] for url in sorted(latest)]
+
+
+_archive: Optional[PageArchive] = None
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """Return the shared page archive, or None if archiving is disabled"""
+    global _archive
+    if _archive is None:
+        archive_config = CONFIG.get('page_archive', {})
+        if not archive_config.get('enabled', False):
+            return None
+        _archive = PageArchive(archive_config['dir'], int(archive_config.get('compresslevel', 6)))
+    return _archive
@@ -0,0 +1,236 @@
+"""
+Asynchronous MongoDB persistence for scraped questions.
+
+Pages are queued to a background writer task that stores each page's
+questions with a single unordered bulk upsert through motor and then
+marks the URL as processed, so the crawler never waits on the database.
+Empty results are recorded through the same queue for the negative cache.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError, DuplicateKeyError
+from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = 'indiabixauto'
+# Set by the scraper's near-duplicate check
+DEDUP_FIELDS = ('duplicate_of', 'duplicate_similarity')
+
+
+_motor_clients: Dict[str, AsyncIOMotorClient] = {}
+
+
+def get_motor_client(mongo_uri: str) -> AsyncIOMotorClient:
+    """Return the run's shared motor client (one connection pool) for a MongoDB URI"""
+    client = _motor_clients.get(mongo_uri)
+    if client is None:
+        client = AsyncIOMotorClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,
+            connectTimeoutMS=5000,
+            socketTimeoutMS=10000
+        )
+        _motor_clients[mongo_uri] = client
+    return client
+
+
+def close_motor_clients():
+    """Close the shared motor clients; call once every store is done"""
+    for client in _motor_clients.values():
+        client.close()
+    _motor_clients.clear()
+
+
+class AsyncQuestionWriter:
+    """Background writer that persists one page per bulk request"""
+
+    def __init__(self, mongo_uri: str, queue_size: int = 64,
+                 on_page_written: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the writer
+
+        Args:
+            mongo_uri: MongoDB connection URI
+            queue_size: Pages that may wait for the database before enqueue blocks
+            on_page_written: Called with the URL once a page has been stored and marked
+        """
+        self.mongo_uri = mongo_uri
+        self.queue_size = queue_size
+        self.on_page_written = on_page_written
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.questions = None
+        self.processed_urls = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.pages_written = 0
+        self.failed_pages = 0
+
+    def _start(self):
+        if self.client is None:
+            self.client = get_motor_client(self.mongo_uri)
+            db = self.client[DATABASE_NAME]
+            self.questions = db['questions']
+            self.processed_urls = db['scraped_urls']
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.ensure_future(self._run())
+
+    async def enqueue(self, url: str, questions: List[Dict[str, Any]],
+                      fingerprint: Optional[str] = None, replace: bool = False):
+        """
+        Queue a page's questions for storage
+
+        Args:
+            url: Page URL (marked as processed once its questions are stored)
+            questions: Questions extracted from the page
+            fingerprint: Content fingerprint stored with the processed marker
+            replace: Whether to delete stored questions of the page that are no longer on it
+        """
+        self._start()
+        await self._queue.put(("page", url, (questions, fingerprint, replace)))
+
+    async def record_empty(self, url: str, status: int):
+        """
+        Queue a negative-cache record for a URL that returned no questions
+
+        Args:
+            url: Page URL
+            status: HTTP status of the fetch
+        """
+        self._start()
+        await self._queue.put(("empty", url, status))
+
+    async def _run(self):
+        while True:
+            kind, url, payload = await self._queue.get()
+            try:
+                if kind == "page":
+                    await self.write_page(url, *payload)
+                else:
+                    await self.write_empty(url, payload)
+            except Exception as e:
+                self.failed_pages += 1
+                logger.error(f"Unexpected error writing {url} to database: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def write_page(self, url: str, questions: List[Dict[str, Any]],
+                         fingerprint: Optional[str] = None, replace: bool = False) -> bool:
+        """
+        Store a page's questions and mark its URL as processed
+
+        Args:
+            url: Page URL
+            questions: Questions extracted from the page
+            fingerprint: Content fingerprint stored with the processed marker
+            replace: Whether to delete stored questions of the page that are no longer on it
+
+        Returns:
+            True if both writes succeeded
+        """
+        self._start()
+        try:
+            operations = []
+            for question in questions:
+                update = {"$set": question}
+                if replace:
+                    # A re-published question may no longer be a near-duplicate
+                    stale = {field: "" for field in DEDUP_FIELDS if field not in question}
+                    if stale:
+                        update["$unset"] = stale
+                operations.append(UpdateOne({"id": question["id"]}, update, upsert=True))
+            if operations:
+                await self.questions.bulk_write(operations, ordered=False)
+            if replace:
+                # A re-published page may have fewer questions than before
+                await self.questions.delete_many(
+                    {"url": url, "id": {"$nin": [question["id"] for question in questions]}}
+                )
+        except PyMongoError as e:
+            self.failed_pages += 1
+            logger.error(f"Error storing questions for {url} in database: {e}")
+            # Leave the URL unmarked so the page is retried on the next run
+            return False
+
+        marker = {
+            "url": url,
+            "processed_at": datetime.now(),
+            "question_count": len(questions),
+            "has_data": True
+        }
+        if fingerprint:
+            marker["content_hash"] = fingerprint
+        try:
+            await self.processed_urls.update_one({"url": url}, {"$set": marker}, upsert=True)
+            logger.info(f"Marked URL as processed: {url} with {len(questions)} questions")
+        except PyMongoError as e:
+            self.failed_pages += 1
+            logger.error(f"Error marking URL as processed: {e}")
+            return False
+
+        self.pages_written += 1
+        if self.on_page_written is not None:
+            self.on_page_written(url)
+        return True
+
+    async def write_empty(self, url: str, status: int) -> bool:
+        """
+        Record an empty result: last status, time of the check and attempt count
+
+        Args:
+            url: Page URL
+            status: HTTP status of the fetch
+
+        Returns:
+            True if the record was written
+        """
+        self._start()
+        now = datetime.now()
+        try:
+            # Never downgrade a URL that already has data
+            await self.processed_urls.update_one(
+                {"url": url, "has_data": {"$ne": True}},
+                {
+                    "$set": {
+                        "url": url,
+                        "has_data": False,
+                        "question_count": 0,
+                        "last_status": status,
+                        "last_checked_at": now
+                    },
+                    "$inc": {"attempts": 1},
+                    "$setOnInsert": {"first_checked_at": now}
+                },
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # The filter missed because the URL has data; nothing to record
+            return True
+        except PyMongoError as e:
+            logger.error(f"Error recording empty result for {url}: {e}")
+            return False
+
+    async def flush(self):
+        """Wait until every queued page has been written"""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def close(self):
+        """Flush pending writes and stop the writer task"""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # The client is shared; close_motor_clients() closes it at the end of the run
+        self.client = None
+        if self.pages_written or self.failed_pages:
+            logger.info(f"Question writer stored {self.pages_written} pages ({self.failed_pages} failed)")
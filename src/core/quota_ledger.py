@@ -0,0 +1,98 @@
+"""
+Shared daily Gemini quota ledger in MongoDB.
+
+One document per day in the `gemini_quota` collection holds the number of
+requests reserved so far. A reservation is a single conditional `$inc`
+(only while the count is below the limit), so any number of concurrent
+runs sharing the API key can never spend more than the daily limit
+between them. A failed call releases its reservation again.
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.core.question_store import DATABASE_NAME, get_motor_client
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = 'gemini_quota'
+
+
+class MongoQuotaLedger:
+    """Atomic reserve/release of daily requests shared through MongoDB"""
+
+    def __init__(self, mongo_uri: str, limit: int, collection_name: str = COLLECTION_NAME):
+        """
+        Initialize the ledger
+
+        Args:
+            mongo_uri: MongoDB connection URI
+            limit: Requests allowed per day
+            collection_name: Collection holding one counter document per day
+        """
+        self.mongo_uri = mongo_uri
+        self.limit = limit
+        self.collection_name = collection_name
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.collection = None
+        self.used = 0
+
+    def _start(self):
+        if self.client is None:
+            self.client = get_motor_client(self.mongo_uri)
+            self.collection = self.client[DATABASE_NAME][self.collection_name]
+
+    @staticmethod
+    def _day() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    async def reserve(self) -> bool:
+        """
+        Reserve one request of today's quota
+
+        Returns:
+            True if a request was reserved, False if the daily limit is reached
+
+        Raises:
+            PyMongoError: If the ledger cannot be reached
+        """
+        self._start()
+        query = {"_id": self._day(), "used": {"$lt": self.limit}}
+        update = {"$inc": {"used": 1}, "$set": {"updated_at": datetime.now()}}
+        try:
+            doc = await self.collection.find_one_and_update(
+                query, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Today's document exists: either a concurrent first reservation of the day
+            # inserted it, or it is at the limit. Retry without upsert to tell them apart.
+            doc = await self.collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                return False
+        self.used = doc.get("used", 0)
+        return True
+
+    async def release(self):
+        """Give back a reservation whose call failed"""
+        self._start()
+        try:
+            await self.collection.update_one(
+                {"_id": self._day(), "used": {"$gt": 0}},
+                {"$inc": {"used": -1}, "$set": {"updated_at": datetime.now()}}
+            )
+        except PyMongoError as e:
+            logger.warning(f"Could not release Gemini quota reservation: {e}")
+
+    async def remaining(self) -> int:
+        """Requests left today"""
+        self._start()
+        doc = await self.collection.find_one({"_id": self._day()}, {"used": 1})
+        return max(0, self.limit - (doc or {}).get("used", 0))
+
+    def close(self):
+        # The client is shared; close_motor_clients() closes it
+        self.client = None
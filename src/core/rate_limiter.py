@@ -0,0 +1,88 @@
+"""
+Token-bucket rate limiter for requests per minute and tokens per minute.
+
+Both buckets refill continuously. A caller waits until the request
+bucket holds one request and the token bucket holds its estimated
+tokens, then takes both; once the real token usage is known the
+difference is settled so later calls see the true budget. Bucket
+capacity (the burst) is kept small so no rolling minute can exceed
+the configured rates by more than one burst.
+"""
+import time
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """Async limiter enforcing requests-per-minute and tokens-per-minute budgets"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, burst_requests: int = 1):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_minute: Sustained request rate
+            tokens_per_minute: Sustained token rate
+            burst_requests: Requests that may be sent back to back when the buckets are full
+        """
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(1.0, float(burst_requests))
+        self.token_capacity = max(1.0, tokens_per_minute * self.request_capacity / max(requests_per_minute, 1.0))
+        self.requests = self.request_capacity
+        self.tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.request_rate)
+        self.tokens = min(self.token_capacity, self.tokens + elapsed * self.token_rate)
+
+    def _get_lock(self) -> asyncio.Lock:
+        # The lock belongs to the loop it was created on
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until one request and `tokens` tokens are available and take them
+
+        Args:
+            tokens: Estimated tokens of the request (capped at the bucket size)
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(float(tokens), self.token_capacity)
+        waited = 0.0
+        # Callers are served in arrival order
+        async with self._get_lock():
+            while True:
+                self._refill()
+                if self.requests >= 1 and self.tokens >= tokens:
+                    self.requests -= 1
+                    self.tokens -= tokens
+                    return waited
+                delay = max(
+                    (1 - self.requests) / self.request_rate if self.requests < 1 else 0.0,
+                    (tokens - self.tokens) / self.token_rate if self.tokens < tokens else 0.0
+                )
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once the real usage of a request is known"""
+        self._refill()
+        taken = min(float(estimated_tokens), self.token_capacity)
+        # Negative balances are allowed: an underestimate delays the next caller
+        self.tokens = min(self.token_capacity, self.tokens + taken - actual_tokens)
@@ -7,17 +7,34 @@ import os
 import re
 import sys
 import json
-import aiohttp
 import asyncio
 import logging
 import calendar
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple, AsyncIterator, Iterable
 from datetime import datetime as dt, timedelta
-from bs4 import BeautifulSoup, Tag
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
 from src.core.utils import setup_mongodb_connection
+from src.core.crawler import AsyncCrawler, FetchResult, get_crawler
+from src.core.question_store import AsyncQuestionWriter
+from src.core.url_index import ProcessedURLIndex
+from src.core.negative_cache import NegativeCachePolicy
+from src.core.date_discovery import DateDiscovery
+from src.core.page_archive import ArchivedPage, PageArchive, get_page_archive
+from src.core.dedup import NearDuplicateIndex, question_text
+from src.core.classifier import get_classifier
+from src.core.extractors import (
+    BaseExtractor,
+    get_extractor,
+    get_parse_executor,
+    parse_page,
+    fingerprint_questions,
+    url_age_days,
+    clean_html_text,
+    determine_difficulty
+)
+from src.config.settings import CONFIG
 
 # Configure logging
 logging.basicConfig(
@@ -32,17 +49,73 @@ class AsyncDataScraper:
     Asynchronous data scraper for fetching current affairs questions from IndiaBix
     """
     
-    def __init__(self, mongo_uri: Optional[str] = None):
+    def __init__(self, mongo_uri: Optional[str] = None, crawler: Optional[AsyncCrawler] = None,
+                 use_http_cache: bool = True, extractor: Optional[BaseExtractor] = None,
+                 use_discovery: bool = True):
         """
         Initialize the scraper with optional MongoDB connection
         
         Args:
             mongo_uri: MongoDB connection URI (optional)
+            crawler: HTTP crawler to use (defaults to the shared process-wide crawler)
+            use_http_cache: Whether to revalidate pages against the on-disk HTTP cache
+            extractor: HTML extraction backend (defaults to CONFIG['scraper']['extractor'])
+            use_discovery: Whether to learn published dates from listing pages
+                           instead of probing every calendar day
         """
         self.mongo_uri = mongo_uri
+        self.crawler = crawler or get_crawler()
+        self.use_http_cache = use_http_cache
+        scraper_config = CONFIG.get('scraper', {})
+        self.extractor = extractor or get_extractor(scraper_config.get('extractor'))
+        self.parse_executor_mode = scraper_config.get('parse_executor', 'auto')
+        self.parse_workers = int(scraper_config.get('parse_workers', 0))
+        self.max_pages_in_flight = int(scraper_config.get('max_pages_in_flight', 8))
         self.db = None
         self.processed_urls_collection = None
         self.questions_collection = None
+        self.writer: Optional[AsyncQuestionWriter] = None
+        self.url_index: Optional[ProcessedURLIndex] = None
+        self.negative_cache: Optional[NegativeCachePolicy] = None
+        self.discovery: Optional[DateDiscovery] = None
+        self.archive: Optional[PageArchive] = get_page_archive()
+        
+        # Processed dates this recent are re-fetched and compared by content fingerprint
+        revalidation_config = scraper_config.get('revalidation', {})
+        self.revalidate_days: Optional[int] = None
+        if revalidation_config.get('enabled', True):
+            self.revalidate_days = int(revalidation_config.get('days', 3))
+        
+        # Near-duplicates of questions from earlier dates are flagged at scrape time
+        dedup_config = scraper_config.get('dedup', {})
+        self.dedup: Optional[NearDuplicateIndex] = None
+        self.dedup_mode = dedup_config.get('mode', 'flag')
+        if self.dedup_mode not in ('flag', 'drop'):
+            logger.warning(f"Unknown dedup mode '{self.dedup_mode}', only flagging near-duplicates")
+            self.dedup_mode = 'flag'
+        self.dedup_lookback_days = int(dedup_config.get('lookback_days', 60))
+        self._dedup_history: Optional[asyncio.Future] = None
+        if dedup_config.get('enabled', True):
+            self.dedup = NearDuplicateIndex(
+                threshold=float(dedup_config.get('threshold', 0.7)),
+                num_perm=int(dedup_config.get('num_perm', 64)),
+                bands=int(dedup_config.get('bands', 16))
+            )
+        
+        discovery_config = scraper_config.get('discovery', {})
+        if use_discovery and discovery_config.get('enabled', True):
+            self.discovery = DateDiscovery.from_config(self.crawler, discovery_config, use_cache=use_http_cache)
+        
+        negative_config = scraper_config.get('negative_cache', {})
+        if negative_config.get('enabled', True):
+            self.negative_cache = NegativeCachePolicy.from_config(negative_config)
+        
+        index_config = scraper_config.get('url_index', {})
+        if index_config.get('enabled', False):
+            self.url_index = ProcessedURLIndex(
+                index_config['path'],
+                max_age_seconds=float(index_config.get('max_age_hours', 6)) * 3600
+            )
         
         # Set up MongoDB connection if URI is provided
         if mongo_uri:
@@ -54,17 +127,118 @@ class AsyncDataScraper:
                     self.db = mongo_data.get("db")
                     self.processed_urls_collection = mongo_data.get("processed_urls")
                     self.questions_collection = mongo_data.get("questions")
+                    # Page writes go through motor on a background task
+                    self.writer = AsyncQuestionWriter(mongo_uri, on_page_written=self._on_page_written)
             except Exception as e:
                 logger.error(f"Error connecting to MongoDB: {e}")
                 # Continue without database
     
-    def get_processed_urls(self) -> Set[str]:
+    def get_url_records(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the `scraped_urls` records of the candidate URLs
+        
+        Only the candidates are looked up, with one indexed `$in` query. When the
+        local index is fresh, only the candidates it does not know as processed are
+        queried (for their negative-cache state), and none at all without a
+        negative-cache policy.
+        
+        Args:
+            urls: Candidate URLs to check
+        
+        Returns:
+            Mapping of URL to its record, for URLs that have one
+        """
+        records = {}
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return records
+        
+        # Skip the database for processed URLs when the local index covers the candidates
+        if self.url_index is not None and self.url_index.is_fresh_for(urls):
+            processed_urls = self.url_index.processed_among(urls)
+            logger.info(f"Local URL index is fresh: {len(processed_urls)} of {len(urls)} candidate URLs already processed")
+            records = {url: {"url": url, "has_data": True} for url in processed_urls}
+            # The index does not track empty dates, so their backoff state still comes from the database
+            unprocessed = [url for url in urls if url not in processed_urls]
+            if unprocessed and self.negative_cache is not None:
+                records.update(self._query_url_records(unprocessed))
+            return records
+        
+        # If MongoDB is not connected, return no records
+        if self.processed_urls_collection is None:
+            return records
+        
+        try:
+            records = self._query_url_records(urls, raise_errors=True)
+            
+            processed_urls = {url for url, doc in records.items() if doc.get("has_data")}
+            logger.info(f"Found {len(processed_urls)} of {len(urls)} candidate URLs already processed with data")
+            if self.url_index is not None:
+                self.url_index.record_sync(urls, processed_urls)
+        except Exception as e:
+            logger.error(f"Error getting processed URLs: {e}")
+        
+        return records
+    
+    def _query_url_records(self, urls: List[str], raise_errors: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Load the `scraped_urls` records of the given URLs with one `$in` query"""
+        records = {}
+        if self.processed_urls_collection is None:
+            return records
+        try:
+            cursor = self.processed_urls_collection.find(
+                {"url": {"$in": urls}},
+                {"_id": 0, "url": 1, "has_data": 1, "content_hash": 1,
+                 "last_status": 1, "last_checked_at": 1, "attempts": 1}
+            )
+            for doc in cursor:
+                records[doc["url"]] = doc
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Error getting URL records: {e}")
+        return records
+    
+    def get_content_hashes(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the stored content fingerprints of processed URLs
+        
+        Args:
+            urls: URLs to look up
+        
+        Returns:
+            Mapping of URL to fingerprint, for URLs that have one
+        """
+        hashes = {}
+        urls = list(urls)
+        if not urls or self.processed_urls_collection is None:
+            return hashes
+        try:
+            cursor = self.processed_urls_collection.find(
+                {"url": {"$in": urls}, "content_hash": {"$exists": True}},
+                {"_id": 0, "url": 1, "content_hash": 1}
+            )
+            for doc in cursor:
+                hashes[doc["url"]] = doc["content_hash"]
+        except Exception as e:
+            logger.error(f"Error getting content fingerprints: {e}")
+        return hashes
+    
+    def get_processed_urls(self, urls: Optional[Iterable[str]] = None) -> Set[str]:
         """
         Get set of already processed URLs that had data
         
+        Args:
+            urls: Candidate URLs to check. Only these are looked up (see get_url_records).
+                  When omitted, every processed URL is loaded.
+        
         Returns:
             Set of URLs that have already been processed and had data
         """
+        if urls is not None:
+            records = self.get_url_records(urls)
+            return {url for url, doc in records.items() if doc.get("has_data")}
+        
         processed_urls = set()
         
         # If MongoDB is not connected, return empty set
@@ -86,6 +260,49 @@ class AsyncDataScraper:
         
         return processed_urls
     
+    def get_questions_for_dates(self, dates: Iterable[str],
+                                raise_errors: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load stored questions of the given dates in page order
+
+        In "drop" dedup mode flagged near-duplicates are left out, as when the
+        dates were scraped.
+
+        Args:
+            dates: Dates (YYYY-MM-DD) to load
+            raise_errors: Whether database errors are raised instead of logged
+
+        Returns:
+            Mapping of date to its questions, for dates that have any
+        """
+        questions_by_date: Dict[str, List[Dict[str, Any]]] = {}
+        dates = list(dates)
+        if not dates or self.questions_collection is None:
+            return questions_by_date
+        try:
+            query = {"date": {"$in": dates}}
+            if self.dedup is not None and self.dedup_mode == 'drop':
+                query["duplicate_of"] = {"$exists": False}
+            for doc in self.questions_collection.find(query, {"_id": 0}):
+                questions_by_date.setdefault(doc["date"], []).append(doc)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Error loading stored questions: {e}")
+
+        def page_order(question):
+            index = str(question.get("id", "")).rsplit("-", 1)[-1]
+            return int(index) if index.isdigit() else 0
+
+        for questions in questions_by_date.values():
+            questions.sort(key=page_order)
+        return questions_by_date
+
+    def _on_page_written(self, url: str):
+        """Keep the local URL index in step with pages the writer marked as processed"""
+        if self.url_index is not None:
+            self.url_index.mark_processed(url)
+    
     @staticmethod
     def clean_html_text(text: str) -> str:
         """
@@ -97,39 +314,39 @@ class AsyncDataScraper:
         Returns:
             Cleaned text
         """
-        # Remove HTML tags
-        text = re.sub(r'<[^>]*>', '', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove leading/trailing whitespace
-        text = text.strip()
-        
-        return text
+        return clean_html_text(text)
     
-    async def fetch_url(self, url: str, session: aiohttp.ClientSession) -> str:
+    async def fetch_page(self, url: str) -> FetchResult:
         """
-        Fetch a URL using aiohttp
+        Fetch a URL through the shared crawler
         
         Args:
             url: URL to fetch
-            session: aiohttp ClientSession
             
         Returns:
-            HTML content
+            FetchResult with the HTTP status and body
         """
         try:
-            # Use the existing session which should already have SSL verification disabled
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.error(f"Error fetching URL {url}: {response.status}")
-                    return ""
+            result = await self.crawler.fetch(url, use_cache=self.use_http_cache)
+            if not result.ok and result.status:
+                logger.error(f"Error fetching URL {url}: {result.status}")
+            return result
         except Exception as e:
             logger.error(f"Error fetching URL {url}: {e}")
-            return ""
+            return FetchResult(url=url, status=0, error=str(e))
+    
+    async def fetch_url(self, url: str) -> str:
+        """
+        Fetch a URL through the shared crawler
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            HTML content
+        """
+        result = await self.fetch_page(url)
+        return result.text if result.ok else ""
     
     def extract_question_data(self, html_content: str, url: str) -> List[Dict[str, Any]]:
         """
@@ -142,105 +359,25 @@ class AsyncDataScraper:
         Returns:
             List of extracted questions
         """
-        if not html_content:
-            return []
+        return self.extractor.extract(html_content, url)
+    
+    async def parse_html(self, html_content: str, url: str) -> List[Dict[str, Any]]:
+        """
+        Extract questions on the parse executor so parsing never blocks the event loop
         
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract date from URL
-            date_match = re.search(r'/current-affairs/(\d{4}-\d{2}-\d{2})/', url)
-            if not date_match:
-                logger.error(f"Could not extract date from URL: {url}")
-                return []
-            
-            date = date_match.group(1)
-            
-            # Get all questions
-            questions_data = []
-            
-            # Find all question blocks with the new structure
-            question_blocks = soup.find_all('div', class_='bix-div-container')
-            
-            if not question_blocks:
-                logger.warning(f"No question blocks found for URL: {url}")
-                return []
-            
-            logger.info(f"Found {len(question_blocks)} questions for date: {date}")
-            
-            for i, block in enumerate(question_blocks, 1):
-                try:
-                    # Extract question text from the new structure
-                    question_element = block.find('div', class_='bix-td-qtxt')
-                    if not question_element:
-                        continue
-                    
-                    question_text = self.clean_html_text(str(question_element))
-                    
-                    # Extract options from the new structure
-                    options = []
-                    options_element = block.find('div', class_='bix-tbl-options')
-                    
-                    if options_element:
-                        option_rows = options_element.find_all('div', class_='bix-opt-row')
-                        for option_row in option_rows:
-                            option_value = option_row.find('div', class_='bix-td-option-val')
-                            if option_value:
-                                option_text = self.clean_html_text(str(option_value))
-                                options.append(option_text)
-                    
-                    # Extract correct answer from the new structure
-                    correct_answer = ""
-                    hidden_answer = block.find('input', {'id': lambda x: x and x.startswith('hdnAnswer_')})
-                    
-                    if hidden_answer and 'value' in hidden_answer.attrs:
-                        correct_answer = hidden_answer['value']
-                    
-                    # Extract explanation from the new structure
-                    explanation = ""
-                    explanation_element = block.find('div', class_='bix-ans-description')
-                    
-                    if explanation_element:
-                        explanation = self.clean_html_text(str(explanation_element))
-                    
-                    # Extract category from the new structure
-                    category = "general"
-                    category_element = block.find('div', class_='explain-link')
-                    if category_element:
-                        category_text = self.clean_html_text(str(category_element))
-                        category_match = re.search(r'Category\s*:\s*([^<]+)', category_text)
-                        if category_match:
-                            category = category_match.group(1).strip().lower()
-                    
-                    # Determine difficulty based on explanation length and complexity
-                    difficulty = self._determine_difficulty(explanation, question_text)
-                    
-                    # Create question object
-                    question_data = {
-                        "id": f"{date}-{i}",
-                        "date": date,
-                        "question": question_text,
-                        "options": options,
-                        "correct_answer": correct_answer,
-                        "explanation": explanation,
-                        "difficulty": difficulty,
-                        "category": category,
-                        "url": url
-                    }
-                    
-                    questions_data.append(question_data)
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting question data: {e}")
-                    continue
-            
-            logger.info(f"Extracted {len(questions_data)} questions from URL: {url}")
-            
-            return questions_data
+        Args:
+            html_content: HTML content
+            url: URL of the page
             
-        except Exception as e:
-            logger.error(f"Error parsing HTML content: {e}")
-            return []
+        Returns:
+            List of extracted questions
+        """
+        executor = get_parse_executor(self.parse_executor_mode, self.parse_workers, self.extractor.name)
+        if executor is None:
+            return self.extract_question_data(html_content, url)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, parse_page, html_content, url, self.extractor.name)
     
     def _determine_difficulty(self, explanation: str, question: str) -> str:
         """
@@ -253,13 +390,7 @@ class AsyncDataScraper:
         Returns:
             Difficulty level: easy, medium, or hard
         """
-        # Determine difficulty based on explanation length and complexity
-        if len(explanation) < 100:
-            return "easy"
-        elif len(explanation) < 300:
-            return "medium"
-        else:
-            return "hard"
+        return determine_difficulty(explanation, question)
     
     def _determine_category(self, question: str) -> str:
         """
@@ -271,97 +402,172 @@ class AsyncDataScraper:
         Returns:
             Category: science, sports, politics, etc.
         """
-        question = question.lower()
-        
-        # Define categories and their keywords
-        categories = {
-            "science": ["science", "scientist", "discovery", "invention", "technology", "research", "nasa", "space"],
-            "sports": ["sport", "cricket", "football", "hockey", "tennis", "player", "tournament", "championship", "olympics"],
-            "politics": ["politic", "minister", "government", "election", "party", "president", "prime minister", "parliament"],
-            "economy": ["economy", "economic", "finance", "market", "stock", "trade", "business", "gdp", "fiscal", "monetary"],
-            "awards": ["award", "prize", "medal", "honor", "recognition", "winner", "recipient"],
-            "defense": ["defense", "military", "army", "navy", "air force", "weapon", "missile", "security"],
-            "international": ["international", "global", "world", "un", "united nations", "treaty", "agreement", "foreign"]
-        }
-        
-        # Check if the question contains any category keywords
-        for category, keywords in categories.items():
-            for keyword in keywords:
-                if keyword in question:
-                    return category
-        
-        # Default category
-        return "general"
+        # Whole-word keyword scoring over CONFIG['category_keywords']
+        return get_classifier().classify(question)
     
-    async def process_url(self, url: str, session: aiohttp.ClientSession, processed_urls: Set[str], force_process: bool = False) -> List[Dict[str, Any]]:
+    def categorize_questions(self, questions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Determine the categories of many questions with one compiled matcher
+        
+        Args:
+            questions: Questions with a 'question' field
+            
+        Returns:
+            Categories in the same order as the questions
+        """
+        return get_classifier().classify_batch(question.get('question', '') for question in questions)
+    
+    async def process_url(self, url: str, processed_urls: Set[str], force_process: bool = False,
+                          revalidate: bool = False, previous_fingerprint: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Process a URL to extract questions
         
         Args:
             url: URL to process
-            session: aiohttp ClientSession
             processed_urls: Set of already processed URLs
             force_process: Whether to force processing even if the URL has been processed before
+            revalidate: Whether this is a processed URL being checked for changed content
+            previous_fingerprint: Stored content fingerprint of the URL, when revalidating
             
         Returns:
-            List of extracted questions
+            List of extracted questions (empty when a revalidated page is unchanged)
         """
-        if not force_process and url in processed_urls:
+        if not force_process and not revalidate and url in processed_urls:
             logger.info(f"URL already processed: {url}")
             return []
         
         try:
-            # Fetch URL content using the provided session
-            html_content = await self.fetch_url(url, session)
+            # Fetch URL content through the crawler
+            result = await self.fetch_page(url)
+            
+            html_content = result.text if result.ok else ""
             if not html_content:
+                if revalidate:
+                    logger.warning(f"Could not revalidate URL: {url}")
+                    return []
                 logger.warning(f"No content found at URL: {url}")
+                # A definitive "not there" goes to the negative cache; transient errors do not
+                if result.status in (404, 410) and self.writer is not None:
+                    await self.writer.record_empty(url, result.status)
                 return []
             
-            # Extract questions
-            questions = self.extract_question_data(html_content, url)
+            # Keep the raw page so extraction can be replayed without re-crawling
+            if self.archive is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.archive.store, url, result.body, result.encoding, result.status)
+            
+            # Extract questions off the event loop
+            questions = await self.parse_html(html_content, url)
+            
+            fingerprint = fingerprint_questions(questions) if questions else None
+            published = questions
+            if revalidate:
+                # A 304 is not enough: if storing the last change failed, the HTTP cache
+                # already holds the new page while the stored fingerprint is the old one
+                if not questions or fingerprint == previous_fingerprint:
+                    logger.info(f"Content unchanged{' (not modified)' if result.from_cache else ''}: {url}")
+                    return []
+                if previous_fingerprint is None:
+                    # Processed before fingerprints were stored: record it, nothing to re-render
+                    if self.writer is not None:
+                        await self.writer.enqueue(url, questions, fingerprint)
+                    logger.info(f"Recorded content fingerprint for {url}")
+                    return []
+                logger.info(f"Content changed since last run, re-processing: {url}")
             
             # Only store questions and mark URL as processed if questions were found
             if questions:
                 logger.info(f"Found {len(questions)} questions at URL: {url}")
                 
-                # Store questions in database if MongoDB is connected
-                if self.questions_collection is not None:
-                    for question in questions:
-                        try:
-                            self.questions_collection.update_one(
-                                {"id": question["id"]},
-                                {"$set": question},
-                                upsert=True
-                            )
-                        except Exception as e:
-                            logger.error(f"Error storing question in database: {e}")
+                if self.dedup is not None:
+                    await self._ensure_dedup_history()
+                    duplicates = self._flag_near_duplicates(questions)
+                    if duplicates:
+                        logger.info(f"Found {duplicates} near-duplicates of earlier questions at URL: {url} ({self.dedup_mode})")
+                        if self.dedup_mode == 'drop':
+                            # Still stored (flagged), but not published again
+                            published = [question for question in questions if 'duplicate_of' not in question]
                 
-                # Mark URL as processed if MongoDB is connected
-                if self.processed_urls_collection is not None:
-                    try:
-                        self.processed_urls_collection.update_one(
-                            {"url": url},
-                            {"$set": {
-                                "url": url, 
-                                "processed_at": dt.now(),
-                                "question_count": len(questions),
-                                "has_data": True
-                            }},
-                            upsert=True
-                        )
-                        logger.info(f"Marked URL as processed: {url} with {len(questions)} questions")
-                    except Exception as e:
-                        logger.error(f"Error marking URL as processed: {e}")
+                # Queue one bulk write for the page; the URL is marked as processed
+                # by the writer once its questions are stored
+                if self.writer is not None:
+                    await self.writer.enqueue(url, questions, fingerprint, replace=revalidate)
             else:
                 logger.warning(f"No questions found at URL: {url}")
-                # Do not mark URLs without data as processed, so they will be retried on future runs
+                # Do not mark URLs without data as processed; record the empty result so the
+                # negative cache can decide when the date is worth re-checking
+                if self.writer is not None:
+                    await self.writer.record_empty(url, result.status)
             
-            return questions
+            return published
             
         except Exception as e:
             logger.error(f"Error processing URL {url}: {e}")
             return []
     
+    def _load_dedup_history(self) -> int:
+        """Index stored questions from the lookback window (runs on a worker thread)"""
+        if self.questions_collection is None:
+            return 0
+        cutoff = (dt.now() - timedelta(days=self.dedup_lookback_days)).strftime("%Y-%m-%d")
+        count = 0
+        try:
+            cursor = self.questions_collection.find(
+                {"date": {"$gte": cutoff}},
+                {"_id": 0, "id": 1, "date": 1, "question": 1, "options": 1}
+            )
+            for doc in cursor:
+                if not doc.get("id") or not doc.get("date"):
+                    continue
+                self.dedup.add(doc["id"], doc["date"], self.dedup.signature(question_text(doc)))
+                count += 1
+        except Exception as e:
+            logger.error(f"Error loading questions for near-duplicate detection: {e}")
+        logger.info(f"Near-duplicate index loaded with {count} questions since {cutoff}")
+        return count
+    
+    async def _ensure_dedup_history(self):
+        """Load the near-duplicate history once, off the event loop"""
+        if self._dedup_history is None:
+            loop = asyncio.get_running_loop()
+            self._dedup_history = loop.run_in_executor(None, self._load_dedup_history)
+        await self._dedup_history
+    
+    def _flag_near_duplicates(self, questions: List[Dict[str, Any]]) -> int:
+        """
+        Flag questions that nearly duplicate a question from an earlier date
+        
+        Flagged questions get `duplicate_of` and `duplicate_similarity`; their
+        content is left as scraped. Every question is then added to the index.
+        
+        Args:
+            questions: Questions extracted from one page
+            
+        Returns:
+            Number of near-duplicates found
+        """
+        duplicates = 0
+        for question in questions:
+            signature = self.dedup.signature(question_text(question))
+            match = self.dedup.query(signature, before_date=question['date'])
+            if match is not None:
+                key, similarity, _ = match
+                question['duplicate_of'] = key
+                question['duplicate_similarity'] = round(similarity, 3)
+                duplicates += 1
+            self.dedup.add(question['id'], question['date'], signature)
+        return duplicates
+    
+    async def flush_writes(self):
+        """Wait for queued database writes to finish"""
+        if self.writer is not None:
+            await self.writer.flush()
+    
+    async def close(self):
+        """Flush pending database writes and release the async database client"""
+        if self.writer is not None:
+            await self.writer.close()
+    
     def _is_date_in_range(self, date_str: str, start_date: str, end_date: str) -> bool:
         """Check if a date is within a specified range"""
         date_obj = dt.strptime(date_str, "%Y-%m-%d")
@@ -381,15 +587,318 @@ class AsyncDataScraper:
         Returns:
             List of extracted questions
         """
-        processed_urls = self.get_processed_urls()
-        
-        # Create a session with SSL verification disabled
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            questions = await self.process_url(url, session, processed_urls, force_process)
+        processed_urls = set() if force_process else self.get_processed_urls([url])
+        questions = await self.process_url(url, processed_urls, force_process)
+        await self.flush_writes()
+        self.crawler.log_stats()
         
         return questions
     
+    def _build_candidate_urls(
+        self,
+        specific_date: str = None,
+        specific_month: str = None,
+        date_range: Tuple[str, str] = None
+    ) -> Optional[List[str]]:
+        """
+        Build the list of candidate date URLs for the requested criteria
+        
+        Args:
+            specific_date: Optional specific date (format: YYYY-MM-DD)
+            specific_month: Optional specific month (format: YYYY-MM)
+            date_range: Optional tuple of (start_date, end_date) (format: YYYY-MM-DD)
+            
+        Returns:
+            List of candidate URLs, or None if the criteria are invalid
+        """
+        # If specific date is provided, create URL for that date
+        if specific_date:
+            return [f"https://www.indiabix.com/current-affairs/{specific_date}/"]
+        
+        # If specific month is provided, parse it
+        if specific_month:
+            logger.info(f"Processing specific month: {specific_month}")
+            try:
+                year, month = map(int, specific_month.split('-'))
+            except:
+                logger.error(f"Invalid month format: {specific_month}, expected YYYY-MM")
+                return None
+        else:
+            # Default to current month
+            today = dt.now()
+            year, month = today.year, today.month
+        
+        # Determine the range of days to check
+        current_date = dt.now()
+        
+        # If we are in the first 7 days of a month, we should also check the last 7 days of the previous month
+        # This ensures we don't miss late updates from the previous month
+        days_to_check = []
+        
+        if not specific_month:
+            # Daily run mode: Check current month + potential lookback
+            lookback_days = 0
+            if current_date.day <= 7:
+                lookback_days = 10 # Look back 10 days to be safe (covers last week of prev month)
+                logger.info(f"Early month detected (day {current_date.day}). Adding {lookback_days} days lookback to catch late updates.")
+            
+            start_check = current_date - timedelta(days=current_date.day - 1 + lookback_days)
+            end_check = current_date
+            
+            temp_date = start_check
+            while temp_date <= end_check:
+                days_to_check.append(temp_date.strftime("%Y-%m-%d"))
+                temp_date += timedelta(days=1)
+        else:
+            # Specific month mode: Check all days in that month
+            try:
+                last_day = calendar.monthrange(year, month)[1]
+                # If it's the current month, only go up to today
+                if year == current_date.year and month == current_date.month:
+                    last_day = current_date.day
+                    
+                for d in range(1, last_day + 1):
+                    days_to_check.append(f"{year}-{month:02d}-{d:02d}")
+            except Exception as e:
+                logger.error(f"Error generating days for month {specific_month}: {e}")
+        
+        logger.info(f"Generating URLs for {len(days_to_check)} candidate dates...")
+        
+        # Generate URLs for each day determined
+        urls = []
+        for url_date in days_to_check:
+            # If date_range is provided, check if this date is in range
+            if date_range and not self._is_date_in_range(url_date, date_range[0], date_range[1]):
+                continue
+            urls.append(f"https://www.indiabix.com/current-affairs/{url_date}/")
+        
+        return urls
+    
+    async def _process_urls_streaming(
+        self,
+        urls: List[str],
+        processed_urls: Set[str],
+        force_process: bool = False,
+        revalidations: Optional[Dict[str, Optional[str]]] = None
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Process URLs concurrently and yield each page's questions as soon as it is parsed
+        
+        At most `max_pages_in_flight` pages are scheduled at a time, and new pages are
+        only scheduled once the consumer has taken the finished ones, so memory stays
+        bounded by the number of dates in flight rather than the whole request.
+        
+        Args:
+            urls: URLs to process
+            processed_urls: Set of already processed URLs
+            force_process: Whether to force processing even if the URL has been processed before
+            revalidations: Processed URLs to check for changed content, with their stored fingerprints
+            
+        Yields:
+            Tuples of (url, questions)
+        """
+        revalidations = revalidations or {}
+        
+        def make_coro(url):
+            return self.process_url(
+                url, processed_urls, force_process,
+                revalidate=url in revalidations, previous_fingerprint=revalidations.get(url)
+            )
+        
+        async for url, questions in self._stream_bounded(urls, make_coro):
+            yield url, questions
+    
+    async def _stream_bounded(self, items: Iterable[Any], make_coro) -> AsyncIterator[Tuple[Any, Any]]:
+        """
+        Run one coroutine per item with at most `max_pages_in_flight` running at a time
+        
+        Args:
+            items: Items to process
+            make_coro: Called with an item, returns the coroutine processing it
+            
+        Yields:
+            Tuples of (item, result) in completion order
+        """
+        limit = max(1, self.max_pages_in_flight)
+        item_iterator = iter(items)
+        pending: Dict[asyncio.Task, Any] = {}
+        
+        def schedule():
+            while len(pending) < limit:
+                item = next(item_iterator, None)
+                if item is None:
+                    return
+                task = asyncio.ensure_future(make_coro(item))
+                pending[task] = item
+        
+        schedule()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    yield item, task.result()
+                schedule()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def iter_questions_by_date(
+        self, 
+        specific_date: str = None, 
+        specific_month: str = None,
+        date_range: Tuple[str, str] = None,
+        specific_url: str = None,
+        force_process: bool = False
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Stream questions date by date as each page is fetched and parsed
+        
+        Args:
+            specific_date: Optional specific date to fetch (format: YYYY-MM-DD)
+            specific_month: Optional specific month to fetch (format: YYYY-MM)
+            date_range: Optional tuple of (start_date, end_date) for date range (format: YYYY-MM-DD)
+            specific_url: Optional specific URL to fetch
+            force_process: Whether to force processing of all URLs even if they've been processed before
+            
+        Yields:
+            Tuples of (date, questions) in completion order, only for dates with questions
+        """
+        # If specific URL is provided, process only that URL
+        if specific_url:
+            logger.info(f"Processing specific URL: {specific_url}")
+            questions = await self.process_specific_url(specific_url, force_process)
+            if questions:
+                yield questions[0]['date'], questions
+            return
+        
+        candidate_urls = self._build_candidate_urls(specific_date, specific_month, date_range)
+        if candidate_urls is None:
+            return
+        
+        # Look up only the candidate URLs, so startup cost follows the request size
+        url_records = {} if force_process else self.get_url_records(candidate_urls)
+        processed_urls = {url for url, doc in url_records.items() if doc.get("has_data")}
+        urls_to_process = []
+        skipped_urls = []
+        revalidations: Dict[str, Optional[str]] = {}
+        deferred_empty = 0
+        now = dt.now()
+        
+        for url in candidate_urls:
+            # Check if URL has already been processed
+            if not force_process and url in processed_urls:
+                age_days = url_age_days(url, now)
+                if self.revalidate_days is not None and age_days is not None and age_days <= self.revalidate_days:
+                    # Recent pages may still be edited; re-check them by fingerprint
+                    revalidations[url] = url_records[url].get("content_hash")
+                    continue
+                logger.info(f"Skipping already processed URL: {url}")
+                skipped_urls.append(url)
+            elif (not force_process and self.negative_cache is not None
+                    and not self.negative_cache.should_recheck(url, url_records.get(url), now)):
+                # Empty before and not due for another check yet
+                deferred_empty += 1
+                skipped_urls.append(url)
+            else:
+                urls_to_process.append(url)
+        
+        if deferred_empty:
+            logger.info(f"Negative cache: deferred {deferred_empty} previously empty dates until their next re-check")
+        
+        # Fetch only the remaining dates that the listing pages say exist
+        if urls_to_process and self.discovery is not None and not specific_date:
+            listed_urls = await self.discovery.filter_candidates(urls_to_process)
+            listed = set(listed_urls)
+            skipped_urls.extend(url for url in urls_to_process if url not in listed)
+            urls_to_process = listed_urls
+        
+        if revalidations:
+            # The local URL index does not keep fingerprints; fetch the missing ones
+            missing = [url for url, fingerprint in revalidations.items() if fingerprint is None]
+            revalidations.update(self.get_content_hashes(missing))
+            logger.info(f"Revalidating {len(revalidations)} recent processed URLs for changed content")
+            urls_to_process.extend(revalidations)
+        
+        if not urls_to_process:
+            if skipped_urls:
+                logger.info(f"All URLs have already been processed. Skipped {len(skipped_urls)} URLs.")
+            else:
+                logger.info("No URLs to process")
+            
+            if specific_date:
+                logger.warning(f"No new URLs found for date: {specific_date}")
+            return
+            
+        logger.info(f"Generated {len(urls_to_process)} URLs to process. Skipped {len(skipped_urls)} already processed URLs.")
+        
+        question_count = 0
+        async for url, questions in self._process_urls_streaming(
+            urls_to_process, processed_urls, force_process, revalidations
+        ):
+            if questions:  # Only yield dates that actually have questions
+                question_count += len(questions)
+                yield questions[0]['date'], questions
+        
+        await self.flush_writes()
+        logger.info(f"Processed {question_count} questions from {len(urls_to_process)} URLs")
+        self.crawler.log_stats()
+    
+    async def _parse_archived(self, page: ArchivedPage) -> List[Dict[str, Any]]:
+        """Load an archived page off the event loop and extract its questions"""
+        try:
+            loop = asyncio.get_running_loop()
+            html_content = await loop.run_in_executor(None, self.archive.load, page)
+            return await self.parse_html(html_content, page.url)
+        except Exception as e:
+            logger.error(f"Error replaying archived page {page.url}: {e}")
+            return []
+    
+    async def iter_archived_questions_by_date(
+        self,
+        specific_date: str = None,
+        specific_month: str = None,
+        date_range: Tuple[str, str] = None,
+        specific_url: str = None
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Re-run extraction over the page archive without any network access
+        
+        The latest archived fetch of each matching URL is parsed in parallel on the
+        parse executor. Without criteria every archived page is replayed.
+        
+        Args:
+            specific_date: Optional specific date (format: YYYY-MM-DD)
+            specific_month: Optional specific month (format: YYYY-MM)
+            date_range: Optional tuple of (start_date, end_date) (format: YYYY-MM-DD)
+            specific_url: Optional specific URL
+            
+        Yields:
+            Tuples of (date, questions) in completion order, only for dates with questions
+        """
+        if self.archive is None:
+            logger.error("Page archive is disabled; nothing to replay")
+            return
+        
+        pages = []
+        for page in self.archive.latest([specific_url] if specific_url else None):
+            page_date = page.date
+            if specific_date and page_date != specific_date:
+                continue
+            if specific_month and not (page_date or "").startswith(f"{specific_month}-"):
+                continue
+            if date_range and not (page_date and self._is_date_in_range(page_date, date_range[0], date_range[1])):
+                continue
+            pages.append(page)
+        
+        logger.info(f"Replaying {len(pages)} archived pages")
+        question_count = 0
+        async for page, questions in self._stream_bounded(pages, self._parse_archived):
+            if questions:
+                question_count += len(questions)
+                yield questions[0]['date'], questions
+        logger.info(f"Replayed {question_count} questions from {len(pages)} archived pages")
+    
     async def fetch_all_questions(
         self, 
         specific_date: str = None, 
@@ -413,116 +922,17 @@ class AsyncDataScraper:
         """
         try:
             all_questions = []
+            async for _, questions in self.iter_questions_by_date(
+                specific_date=specific_date,
+                specific_month=specific_month,
+                date_range=date_range,
+                specific_url=specific_url,
+                force_process=force_process
+            ):
+                all_questions.extend(questions)
             
-            # If specific URL is provided, process only that URL
-            if specific_url:
-                logger.info(f"Processing specific URL: {specific_url}")
-                return await self.process_specific_url(specific_url, force_process)
-            
-            # Get already processed URLs
-            processed_urls = self.get_processed_urls()
-            urls_to_process = []
-            skipped_urls = []
-            
-            # If specific date is provided, create URL for that date
-            if specific_date:
-                url = f"https://www.indiabix.com/current-affairs/{specific_date}/"
-                if not force_process and url in processed_urls:
-                    logger.info(f"Skipping already processed URL: {url}")
-                    skipped_urls.append(url)
-                else:
-                    urls_to_process.append(url)
-            else:
-                # If specific month is provided, parse it
-                if specific_month:
-                    logger.info(f"Processing specific month: {specific_month}")
-                    try:
-                        year, month = map(int, specific_month.split('-'))
-                    except:
-                        logger.error(f"Invalid month format: {specific_month}, expected YYYY-MM")
-                        return []
-                else:
-                    # Default to current month
-                    today = dt.now()
-                    year, month = today.year, today.month
-                
-                # Determine the range of days to check
-                current_date = dt.now()
-                
-                # If we are in the first 7 days of a month, we should also check the last 7 days of the previous month
-                # This ensures we don't miss late updates from the previous month
-                days_to_check = []
-                
-                if not specific_month and not specific_date:
-                    # Daily run mode: Check current month + potential lookback
-                    lookback_days = 0
-                    if current_date.day <= 7:
-                        lookback_days = 10 # Look back 10 days to be safe (covers last week of prev month)
-                        logger.info(f"Early month detected (day {current_date.day}). Adding {lookback_days} days lookback to catch late updates.")
-                    
-                    start_check = current_date - timedelta(days=current_date.day - 1 + lookback_days)
-                    end_check = current_date
-                    
-                    temp_date = start_check
-                    while temp_date <= end_check:
-                        days_to_check.append(temp_date.strftime("%Y-%m-%d"))
-                        temp_date += timedelta(days=1)
-                elif specific_month:
-                    # Specific month mode: Check all days in that month
-                    try:
-                        year, month = map(int, specific_month.split('-'))
-                        last_day = calendar.monthrange(year, month)[1]
-                        # If it's the current month, only go up to today
-                        if year == current_date.year and month == current_date.month:
-                            last_day = current_date.day
-                            
-                        for d in range(1, last_day + 1):
-                            days_to_check.append(f"{year}-{month:02d}-{d:02d}")
-                    except Exception as e:
-                        logger.error(f"Error generating days for month {specific_month}: {e}")
-                
-                logger.info(f"Generating URLs for {len(days_to_check)} candidate dates...")
-                
-                # Generate URLs for each day determined
-                for url_date in days_to_check:
-                    # If date_range is provided, check if this date is in range
-                    if date_range and not self._is_date_in_range(url_date, date_range[0], date_range[1]):
-                        continue
-                    
-                    url = f"https://www.indiabix.com/current-affairs/{url_date}/"
-                    
-                    # Check if URL has already been processed
-                    if not force_process and url in processed_urls:
-                        logger.info(f"Skipping already processed URL: {url}")
-                        skipped_urls.append(url)
-                    else:
-                        urls_to_process.append(url)
-            
-            if not urls_to_process:
-                if skipped_urls:
-                    logger.info(f"All URLs have already been processed. Skipped {len(skipped_urls)} URLs.")
-                else:
-                    logger.info("No URLs to process")
-                
-                if specific_date:
-                    logger.warning(f"No new URLs found for date: {specific_date}")
-                return []
-                
-            logger.info(f"Generated {len(urls_to_process)} URLs to process. Skipped {len(skipped_urls)} already processed URLs.")
-            
-            # Process URLs asynchronously
-            connector = aiohttp.TCPConnector(ssl=False)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                tasks = [self.process_url(url, session, processed_urls, force_process) for url in urls_to_process]
-                results = await asyncio.gather(*tasks)
-                
-                # Flatten the list of lists
-                for questions in results:
-                    if questions:  # Only add to all_questions if there are actually questions
-                        all_questions.extend(questions)
-            
-            logger.info(f"Processed {len(all_questions)} questions from {len(urls_to_process)} URLs")
-                
+            # Keep the chronological order callers of the list API expect
+            all_questions.sort(key=lambda question: question.get('date', ''))
             return all_questions
             
         except Exception as e:
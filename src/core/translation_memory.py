@@ -0,0 +1,232 @@
+"""
+Sentence-level translation memory with fuzzy matching.
+
+IndiaBix explanations reuse a small set of sentence templates ("X is the
+capital of Y", "The scheme was launched in ..."). Every validated
+translation is split into sentences and, when the English and Gujarati
+sides have the same number of sentences, each pair is stored with its
+MinHash signature in SQLite next to the translation cache. Lookups go
+through the LSH index of src.core.dedup, so matching stays fast with tens
+of thousands of sentences; the best matches are sent to Gemini as
+examples of earlier wording. New pairs are also written to the shared
+store (src.core.translation_store).
+"""
+import re
+import time
+import array
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.core.dedup import NearDuplicateIndex
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends: . ! ? and the danda, followed by whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?।])\s+')
+_WORD = re.compile(r'\w+')
+# Initials and dotted abbreviations: "A.", "U.S.", "i.e."
+_INITIALS = re.compile(r'(?:[A-Za-z]\.)+$')
+# Abbreviations that do not end a sentence (lower-cased, with their dot)
+ABBREVIATIONS = frozenset({
+    "dr.", "mr.", "mrs.", "ms.", "prof.", "sr.", "jr.", "st.", "shri.", "smt.", "lt.", "gen.",
+    "col.", "capt.", "maj.", "sgt.", "gov.", "govt.", "dept.", "no.", "nos.", "vs.", "rs.", "approx.",
+    "est.", "fig.", "jan.", "feb.", "mar.", "apr.", "jun.", "jul.", "aug.", "sep.", "sept.", "oct.",
+    "nov.", "dec.", "ltd.", "pvt.", "inc.", "co.", "corp.", "mt.", "ft.", "km.", "kg.",
+})
+MIN_SENTENCE_WORDS = 4
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    last_word = text.rsplit(None, 1)[-1]
+    return last_word.lower() in ABBREVIATIONS or bool(_INITIALS.match(last_word))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, not after abbreviations such as "Dr." or "U.S." """
+    sentences: List[str] = []
+    for piece in _SENTENCE_END.split(text.strip()):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if sentences and _ends_with_abbreviation(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+class TranslationMemory:
+    """Fuzzy sentence matches from earlier translations"""
+
+    def __init__(self, db_file: str, lang: str = "gu", threshold: float = 0.5,
+                 max_sentences: int = 50000, num_perm: int = 32, bands: int = 8):
+        """
+        Initialize the memory and load its most recent sentences
+
+        Args:
+            db_file: SQLite database holding the sentence pairs
+            lang: Target language of the stored translations
+            threshold: Estimated Jaccard similarity (word bigrams) a match needs
+            max_sentences: Most recent sentence pairs kept in the index
+            num_perm: MinHash permutations per signature
+            bands: LSH bands; must divide num_perm
+        """
+        self.lang = lang
+        self.max_sentences = max_sentences
+        self.index = NearDuplicateIndex(threshold, num_perm, bands)
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory_sentences ("
+            " key TEXT PRIMARY KEY, lang TEXT NOT NULL, source TEXT NOT NULL,"
+            " translated TEXT NOT NULL, signature BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_created_at ON memory_sentences (created_at)")
+        self._conn.commit()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _key(self, sentence: str) -> str:
+        return hashlib.sha256(f"{self.lang}\x00{sentence}".encode("utf-8")).hexdigest()
+
+    def _load(self):
+        started = time.monotonic()
+        rows = self._conn.execute(
+            "SELECT key, source, translated, signature FROM memory_sentences WHERE lang = ?"
+            " ORDER BY created_at DESC LIMIT ?", (self.lang, self.max_sentences)
+        ).fetchall()
+        for key, source, translated, blob in rows:
+            signature = tuple(array.array("I", blob))
+            if len(signature) == self.index.num_perm:
+                self.index.add(key, "", signature, {"source": source, "translated": translated})
+        if rows:
+            logger.info(f"Translation memory: {len(self.index)} sentences loaded in {time.monotonic() - started:.2f}s")
+
+    def _insert(self, rows: List[Tuple[str, str, str, str, bytes, float]]):
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO memory_sentences (key, lang, source, translated, signature, created_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not store translation memory: {e}")
+
+    def seed(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add sentence pairs loaded from the shared store
+
+        Args:
+            entries: Dicts with "_id" (sentence key), "source", "translated",
+                     "signature" (list of ints) and "created_at" (epoch seconds)
+
+        Returns:
+            Number of sentences that were new to this memory
+        """
+        rows = []
+        for entry in entries:
+            key = entry["_id"]
+            signature = tuple(entry.get("signature") or ())
+            if key in self.index or len(signature) != self.index.num_perm:
+                continue
+            self.index.add(key, "", signature, {"source": entry["source"], "translated": entry["translated"]})
+            rows.append((key, self.lang, entry["source"], entry["translated"],
+                         array.array("I", signature).tobytes(), float(entry.get("created_at") or time.time())))
+        if rows:
+            self._insert(rows)
+            logger.info(f"Translation memory: {len(rows)} sentences added from the shared store")
+        return len(rows)
+
+    def add_many(self, pairs: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Learn from validated translations
+
+        Args:
+            pairs: Translation per source text; texts whose sentences do not line up
+                   with their translation are skipped
+
+        Returns:
+            The new sentence pairs, in the form accepted by seed (for the shared store)
+        """
+        rows = []
+        now = time.time()
+        for source, translated in pairs.items():
+            sources = split_sentences(source)
+            targets = split_sentences(translated)
+            if len(sources) != len(targets):
+                continue
+            for sentence, target in zip(sources, targets):
+                if len(_WORD.findall(sentence)) < MIN_SENTENCE_WORDS:
+                    continue
+                key = self._key(sentence)
+                if key in self.index:
+                    continue
+                signature = self.index.signature(sentence)
+                self.index.add(key, "", signature, {"source": sentence, "translated": target})
+                rows.append((key, self.lang, sentence, target, array.array("I", signature).tobytes(), now))
+        if rows:
+            self._insert(rows)
+        return [
+            {"_id": key, "source": source, "translated": translated,
+             "signature": list(array.array("I", blob)), "created_at": created_at}
+            for key, _, source, translated, blob, created_at in rows
+        ]
+
+    def examples(self, texts: Iterable[str], limit: int = 8) -> List[Tuple[str, str, float]]:
+        """
+        Find earlier translations of sentences similar to those of `texts`
+
+        Args:
+            texts: Source texts about to be translated
+            limit: Maximum number of examples
+
+        Returns:
+            (English sentence, translation, similarity) tuples, best first
+        """
+        matches: Dict[str, Tuple[str, str, float]] = {}
+        for text in texts:
+            for sentence in split_sentences(text):
+                if len(_WORD.findall(sentence)) < MIN_SENTENCE_WORDS:
+                    continue
+                self.lookups += 1
+                match = self.index.query(self.index.signature(sentence))
+                if match is None:
+                    continue
+                key, similarity, payload = match
+                if payload["source"] == sentence:
+                    self.exact_hits += 1
+                else:
+                    self.fuzzy_hits += 1
+                if key not in matches or matches[key][2] < similarity:
+                    matches[key] = (payload["source"], payload["translated"], similarity)
+        return sorted(matches.values(), key=lambda match: match[2], reverse=True)[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.fuzzy_hits
+        return {
+            "sentences": len(self.index),
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        if stats["lookups"]:
+            logger.info(f"Translation memory: {stats['exact_hits']} exact and {stats['fuzzy_hits']} fuzzy "
+                        f"matches for {stats['lookups']} sentences ({stats['hit_rate']:.0%} hit rate, "
+                        f"{stats['sentences']} sentences indexed)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,282 @@
+"""
+Quota-aware planning of Gujarati translations.
+
+Before anything is sent to Gemini, the planner estimates how many requests
+each date still needs once cached translations (local and shared) are
+subtracted, and compares the total (plus a reserve for recovery requests)
+with today's remaining quota. Dates are admitted newest first while they
+fit; the rest go to a persistent queue and are picked up again by the next
+run, so a Gujarati PDF is only built when its translation can be completed.
+Dates that can never be built (too large for a day's quota, or no longer
+stored) are marked failed in the queue instead of being retried forever.
+"""
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.core.question_store import DATABASE_NAME, get_motor_client
+from src.core.translator import (
+    DAILY_REQUEST_LIMIT,
+    MAX_RECOVERY_REQUESTS,
+    MONGO_DB_URI,
+    collect_pending_translations,
+    pending_batch_sizes,
+    plan_batches,
+    remaining_quota
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILE = ".translation_queue.json"
+QUEUE_COLLECTION = 'translation_queue'
+TRANSLATION_PLANNER = os.environ.get("TRANSLATION_PLANNER", "true").lower() != "false"
+
+
+class TranslationQueue:
+    """Dates whose translation was deferred, kept in MongoDB or a local file"""
+
+    def __init__(self, mongo_uri: Optional[str] = MONGO_DB_URI, queue_file: str = QUEUE_FILE,
+                 collection_name: str = QUEUE_COLLECTION):
+        """
+        Initialize the queue
+
+        Args:
+            mongo_uri: MongoDB connection URI; without it the queue lives in `queue_file`
+            queue_file: Local JSON file used without MongoDB (or when it is unreachable)
+            collection_name: Collection holding one document per deferred date
+        """
+        self.mongo_uri = mongo_uri
+        self.queue_file = queue_file
+        self.collection_name = collection_name
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.collection = None
+
+    def _start(self) -> bool:
+        if not self.mongo_uri:
+            return False
+        if self.client is None:
+            self.client = get_motor_client(self.mongo_uri)
+            self.collection = self.client[DATABASE_NAME][self.collection_name]
+        return True
+
+    def _load_file(self) -> Dict[str, Any]:
+        if os.path.exists(self.queue_file):
+            try:
+                with open(self.queue_file, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read translation queue {self.queue_file}: {e}")
+        return {}
+
+    def _save_file(self, entries: Dict[str, Any]):
+        try:
+            with open(self.queue_file, 'w') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning(f"Could not save translation queue {self.queue_file}: {e}")
+
+    async def dates(self) -> List[str]:
+        """Return the queued dates that have not failed, oldest first"""
+        if self._start():
+            try:
+                cursor = self.collection.find({"failed": {"$ne": True}}, {"_id": 1})
+                return sorted([doc["_id"] async for doc in cursor])
+            except PyMongoError as e:
+                logger.warning(f"Translation queue unavailable, using local file: {e}")
+        return sorted(date for date, entry in self._load_file().items() if not entry.get("failed"))
+
+    async def add(self, dates: Iterable[str], reason: str = "quota"):
+        """Queue dates for a later run (already queued dates keep their queue time)"""
+        dates = list(dates)
+        if not dates:
+            return
+        now = datetime.now()
+        if self._start():
+            try:
+                await self.collection.bulk_write([
+                    UpdateOne(
+                        {"_id": date},
+                        {
+                            "$set": {"reason": reason, "updated_at": now},
+                            "$unset": {"failed": ""},
+                            "$setOnInsert": {"queued_at": now}
+                        },
+                        upsert=True
+                    )
+                    for date in dates
+                ], ordered=False)
+                return
+            except PyMongoError as e:
+                logger.warning(f"Translation queue unavailable, using local file: {e}")
+        entries = self._load_file()
+        for date in dates:
+            entry = entries.setdefault(date, {"queued_at": now.isoformat()})
+            entry["reason"] = reason
+            entry.pop("failed", None)
+        self._save_file(entries)
+
+    async def fail(self, dates: Iterable[str], reason: str):
+        """Mark dates that can never be translated, so they are kept for inspection but not retried"""
+        dates = list(dates)
+        if not dates:
+            return
+        logger.error(f"Giving up on the Gujarati PDFs of {', '.join(sorted(dates))}: {reason}")
+        now = datetime.now()
+        if self._start():
+            try:
+                await self.collection.bulk_write([
+                    UpdateOne(
+                        {"_id": date},
+                        {"$set": {"failed": True, "reason": reason, "updated_at": now},
+                         "$setOnInsert": {"queued_at": now}},
+                        upsert=True
+                    )
+                    for date in dates
+                ], ordered=False)
+                return
+            except PyMongoError as e:
+                logger.warning(f"Translation queue unavailable, using local file: {e}")
+        entries = self._load_file()
+        for date in dates:
+            entries.setdefault(date, {"queued_at": now.isoformat()}).update({"failed": True, "reason": reason})
+        self._save_file(entries)
+
+    async def remove(self, dates: Iterable[str]):
+        """Drop dates whose translation is done"""
+        dates = list(dates)
+        if not dates:
+            return
+        if self._start():
+            try:
+                await self.collection.delete_many({"_id": {"$in": dates}})
+                return
+            except PyMongoError as e:
+                logger.warning(f"Translation queue unavailable, using local file: {e}")
+        entries = self._load_file()
+        if any(date in entries for date in dates):
+            for date in dates:
+                entries.pop(date, None)
+            self._save_file(entries)
+
+    def close(self):
+        # The client is shared; close_motor_clients() closes it
+        self.client = None
+
+
+class TranslationPlanner:
+    """Fits per-date translation work into the remaining daily quota"""
+
+    def __init__(self, target_lang: str = "gu", daily_limit: int = DAILY_REQUEST_LIMIT,
+                 recovery_reserve: int = MAX_RECOVERY_REQUESTS):
+        """
+        Initialize the planner
+
+        Args:
+            target_lang: Language the dates will be translated into
+            daily_limit: Requests allowed per day; dates needing more can never fit
+            recovery_reserve: Requests kept back for re-sending lost or untranslated
+                              keys; pass the same number to translate_contents
+        """
+        self.target_lang = target_lang
+        self.daily_limit = daily_limit
+        self.recovery_reserve = recovery_reserve
+
+    async def _pending_sizes(self, dated: Dict[str, Dict[str, Any]]) -> Dict[str, List[int]]:
+        """Estimated tokens of the groups each date still needs translated, in sending order"""
+        pending, _, _ = await collect_pending_translations(dated, self.target_lang, track=False)
+        sizes: Dict[str, List[int]] = {date: [] for date in dated}
+        for (date, _), size in zip(pending, pending_batch_sizes(pending)):
+            sizes[date].append(size)
+        return sizes
+
+    async def estimate(self, data: Dict[str, Any]) -> int:
+        """
+        Estimate the Gemini requests needed to translate one date on its own
+
+        Args:
+            data: Template data of the date (see prepare_data_for_template)
+
+        Returns:
+            Number of requests after cache hits (recovery requests not included)
+        """
+        sizes = await self._pending_sizes({None: data})
+        return len(plan_batches(sizes[None]))
+
+    async def plan(self, dated: Dict[str, Dict[str, Any]],
+                   remaining: Optional[int] = None) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Decide which dates to translate now
+
+        Dates are considered newest first and admitted while the requests of all
+        admitted dates, packed together exactly as translate_contents packs them
+        (given the accepted dates in the returned order), plus the recovery
+        reserve fit into the remaining quota; the first date that does not fit and
+        every older one are deferred. Fully cached dates are always admitted, and
+        dates that alone need more than a whole day's quota are rejected.
+
+        Args:
+            dated: Template data per date (YYYY-MM-DD)
+            remaining: Requests left today (looked up when omitted)
+
+        Returns:
+            (accepted, deferred, rejected) lists of dates, newest first
+        """
+        if remaining is None:
+            remaining = await remaining_quota()
+        order = sorted(dated, reverse=True)
+        sizes = await self._pending_sizes({date: dated[date] for date in order})
+        budget = remaining - self.recovery_reserve
+
+        accepted, deferred, rejected = [], [], []
+        admitted: List[int] = []
+        requests = 0
+        full = False
+        for date in order:
+            if not sizes[date]:
+                accepted.append(date)
+                continue
+            alone = len(plan_batches(sizes[date]))
+            if alone + self.recovery_reserve > self.daily_limit:
+                logger.error(f"Translating {date} needs {alone} requests plus {self.recovery_reserve} in reserve, "
+                             f"more than the daily limit of {self.daily_limit}")
+                rejected.append(date)
+                continue
+            needed = len(plan_batches(admitted + sizes[date])) if not full else budget + 1
+            if needed <= budget:
+                accepted.append(date)
+                admitted += sizes[date]
+                requests = needed
+            else:
+                # Keep strict newest-first order: no older date jumps the queue
+                full = True
+                deferred.append(date)
+
+        total = len(plan_batches([size for date in order for size in sizes[date]]))
+        logger.info(
+            f"Translation plan: {total} requests needed, {remaining} left today; "
+            f"{len(accepted)} dates now ({requests} requests + {self.recovery_reserve} for recovery), "
+            f"{len(deferred)} deferred, {len(rejected)} rejected"
+        )
+        return accepted, deferred, rejected
+
+
+_translation_queue: Optional[TranslationQueue] = None
+
+
+def get_translation_queue() -> TranslationQueue:
+    """Return the shared queue of deferred translation dates"""
+    global _translation_queue
+    if _translation_queue is None:
+        _translation_queue = TranslationQueue()
+    return _translation_queue
+
+
+def close_translation_queue():
+    global _translation_queue
+    if _translation_queue is not None:
+        _translation_queue.close()
+        _translation_queue = None
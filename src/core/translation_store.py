@@ -0,0 +1,175 @@
+"""
+Shared translation store in MongoDB.
+
+CI runners start without the local SQLite database, so everything the
+translator learns is also kept here. Translations live in the
+`translations` collection of the `indiabixauto` database, keyed by the
+same text hash as the local cache and tagged with the ids of the questions
+they belong to (lookups go by hash only, since a translation is reused for
+exactly the same text); the translator reads through to this store before
+calling Gemini and writes every new translation back. The sentence pairs
+of the translation memory are kept in the `translation_memory` collection
+and seed the memory once per run.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.core.question_store import DATABASE_NAME, get_motor_client
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = 'translations'
+MEMORY_COLLECTION_NAME = 'translation_memory'
+
+
+class MongoTranslationStore:
+    """Bulk lookups and writes of translations by text hash and question id"""
+
+    def __init__(self, mongo_uri: str, collection_name: str = COLLECTION_NAME,
+                 memory_collection_name: str = MEMORY_COLLECTION_NAME):
+        """
+        Initialize the store
+
+        Args:
+            mongo_uri: MongoDB connection URI
+            collection_name: Collection holding the translations
+            memory_collection_name: Collection holding the translation memory's sentence pairs
+        """
+        self.mongo_uri = mongo_uri
+        self.collection_name = collection_name
+        self.memory_collection_name = memory_collection_name
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.collection = None
+        self.memory_collection = None
+        self._indexes_ready = False
+        self.hits = 0
+        self.misses = 0
+
+    async def _start(self):
+        if self.client is None:
+            self.client = get_motor_client(self.mongo_uri)
+            self.collection = self.client[DATABASE_NAME][self.collection_name]
+            self.memory_collection = self.client[DATABASE_NAME][self.memory_collection_name]
+        if not self._indexes_ready:
+            await self.memory_collection.create_index([("lang", 1), ("created_at", -1)])
+            self._indexes_ready = True
+
+    async def get_many(self, keys: Dict[str, str], lang: str) -> Dict[str, str]:
+        """
+        Look up translations in one query
+
+        Args:
+            keys: Mapping of text hash to source text (the hash includes the language)
+            lang: Target language
+
+        Returns:
+            Mapping of source text to translation for the hits
+        """
+        if not keys:
+            return {}
+
+        found = {}
+        try:
+            await self._start()
+            async for doc in self.collection.find({"_id": {"$in": list(keys)}}, {"translated": 1}):
+                found[keys[doc["_id"]]] = doc["translated"]
+        except PyMongoError as e:
+            logger.warning(f"Shared translation store unavailable: {e}")
+            return {}
+
+        hits = sum(1 for text in keys.values() if text in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    async def set_many(self, entries: Dict[str, Dict[str, object]], lang: str):
+        """
+        Store translations with one unordered bulk write
+
+        Args:
+            entries: Mapping of text hash to {"source", "translated", "question_ids"}
+            lang: Target language
+        """
+        if not entries:
+            return
+        now = datetime.now()
+        operations = []
+        for key, entry in entries.items():
+            update = {
+                "$set": {
+                    "lang": lang,
+                    "source": entry["source"],
+                    "translated": entry["translated"],
+                    "updated_at": now
+                },
+                "$setOnInsert": {"created_at": now}
+            }
+            question_ids: List[str] = [i for i in entry.get("question_ids") or () if i]
+            if question_ids:
+                update["$addToSet"] = {"question_ids": {"$each": question_ids}}
+            operations.append(UpdateOne({"_id": key}, update, upsert=True))
+        try:
+            await self._start()
+            await self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            logger.warning(f"Could not save translations to the shared store: {e}")
+
+    async def memory_sentences(self, lang: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Load the most recent sentence pairs of the translation memory
+
+        Args:
+            lang: Target language
+            limit: Maximum number of pairs
+
+        Returns:
+            Dicts with "_id", "source", "translated", "signature" and "created_at",
+            newest first (empty when the store is unavailable)
+        """
+        try:
+            await self._start()
+            cursor = self.memory_collection.find(
+                {"lang": lang}, {"source": 1, "translated": 1, "signature": 1, "created_at": 1}
+            ).sort("created_at", -1).limit(limit)
+            return [doc async for doc in cursor]
+        except PyMongoError as e:
+            logger.warning(f"Shared translation memory unavailable: {e}")
+            return []
+
+    async def add_memory_sentences(self, entries: List[Dict[str, Any]], lang: str):
+        """
+        Store new sentence pairs of the translation memory (existing pairs are kept)
+
+        Args:
+            entries: Dicts with "_id", "source", "translated", "signature" and "created_at"
+            lang: Target language
+        """
+        if not entries:
+            return
+        operations = [
+            UpdateOne(
+                {"_id": entry["_id"]},
+                {"$setOnInsert": {
+                    "lang": lang,
+                    "source": entry["source"],
+                    "translated": entry["translated"],
+                    "signature": entry["signature"],
+                    "created_at": entry["created_at"]
+                }},
+                upsert=True
+            )
+            for entry in entries
+        ]
+        try:
+            await self._start()
+            await self.memory_collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            logger.warning(f"Could not save translation memory to the shared store: {e}")
+
+    def close(self):
+        # The client is shared; close_motor_clients() closes it
+        self.client = None
+        self._indexes_ready = False
@@ -0,0 +1,116 @@
+"""
+Validation of Gemini translations before they are used or cached.
+
+Gemini sometimes returns a string unchanged (or mostly English). A
+translation passes when, after glossary terms and acronyms are removed,
+enough of its letters are in Gujarati script; the ratio is counted in one
+pass over the characters. Sources that are nothing but numbers, dates,
+acronyms and glossary terms are untranslatable and always pass.
+"""
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config.settings import CONFIG
+
+logger = logging.getLogger(__name__)
+
+GUJARATI_START = 0x0A80
+GUJARATI_END = 0x0AFF
+DEFAULT_MIN_RATIO = 0.5
+
+# Acronyms and alphanumeric codes ("ISRO", "UNESCO", "PM-KISAN", "5G") stay in Latin script
+ACRONYM_PATTERN = re.compile(r"\b(?=[A-Z0-9-]*[A-Z])[A-Z0-9][A-Z0-9&.-]*[A-Z0-9]\b|\b\d+[A-Za-z]{1,2}\b")
+
+
+def count_scripts(text: str) -> Tuple[int, int]:
+    """Count Gujarati and Latin letters of a text in one pass (Gujarati marks count as Gujarati)"""
+    gujarati = latin = 0
+    for char in text:
+        code = ord(char)
+        if GUJARATI_START <= code <= GUJARATI_END:
+            gujarati += 1
+        elif ('a' <= char <= 'z') or ('A' <= char <= 'Z'):
+            latin += 1
+    return gujarati, latin
+
+
+class TranslationValidator:
+    """Separates usable translations from unchanged or mostly-English ones"""
+
+    def __init__(self, glossary: Iterable[str] = (), min_ratio: float = DEFAULT_MIN_RATIO):
+        """
+        Initialize the validator
+
+        Args:
+            glossary: Terms that may legitimately stay in Latin script (matched case-insensitively)
+            min_ratio: Minimum share of Gujarati among the remaining letters
+        """
+        self.min_ratio = min_ratio
+        # Longest terms first so "Make in India" is removed before "India"
+        terms = sorted({term.strip() for term in glossary if term.strip()}, key=len, reverse=True)
+        self._glossary = re.compile(
+            r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE
+        ) if terms else None
+
+    def _strip_kept_terms(self, text: str) -> str:
+        if self._glossary is not None:
+            text = self._glossary.sub(" ", text)
+        return ACRONYM_PATTERN.sub(" ", text)
+
+    def is_untranslatable(self, source: str) -> bool:
+        """Whether a source has no letters left once kept terms are removed"""
+        return count_scripts(self._strip_kept_terms(source))[1] == 0
+
+    def gujarati_ratio(self, text: str) -> float:
+        """Share of Gujarati among the letters of a text, ignoring kept terms"""
+        gujarati, latin = count_scripts(self._strip_kept_terms(text))
+        if gujarati + latin == 0:
+            return 1.0
+        return gujarati / (gujarati + latin)
+
+    def is_valid(self, source: str, translated: str) -> bool:
+        """Check one translation against its source"""
+        if not translated or not translated.strip():
+            return False
+        if self.is_untranslatable(source):
+            return True
+        if translated.strip() == source.strip():
+            return False
+        return self.gujarati_ratio(translated) >= self.min_ratio
+
+    def split(self, sources: Dict[str, str], translated: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Validate the translations of a response
+
+        Args:
+            sources: Source text per key
+            translated: Translation per key (keys missing here are not reported)
+
+        Returns:
+            (valid translations per key, keys that failed validation)
+        """
+        valid = {}
+        failed = []
+        for key, value in translated.items():
+            if self.is_valid(sources[key], value):
+                valid[key] = value
+            else:
+                failed.append(key)
+        return valid, failed
+
+
+_validator: Optional[TranslationValidator] = None
+
+
+def get_translation_validator() -> Optional[TranslationValidator]:
+    """Return the shared validator built from CONFIG['translation_validation'], or None if disabled"""
+    global _validator
+    config = CONFIG.get("translation_validation", {})
+    if not config.get("enabled", True):
+        return None
+    if _validator is None:
+        _validator = TranslationValidator(
+            config.get("glossary", []),
+            config.get("min_gujarati_ratio", DEFAULT_MIN_RATIO)
+        )
+    return _validator
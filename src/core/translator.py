@@ -7,14 +7,23 @@ import time
 import os
 import re
 import json
+import sqlite3
+import hashlib
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 from google import genai
+from src.core.translation_store import MongoTranslationStore
+from src.core.rate_limiter import TokenBucketLimiter
+from src.core.quota_ledger import MongoQuotaLedger
+from src.core.translation_validator import count_scripts, get_translation_validator
+from src.core.translation_memory import TranslationMemory
+from pymongo.errors import PyMongoError
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type
+    retry_if_not_exception_type
 )
 
 # Configure logging
@@ -23,10 +32,37 @@ logger = logging.getLogger(__name__)
 # Gemini API Configuration
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-flash-latest"  # Use latest flash
-REQUEST_DELAY_SECONDS = 4.5  # To stay safely under 15 RPM
+# Token-bucket limits replace the fixed delay between calls; with the default
+# burst no rolling minute exceeds 15 requests
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", "12"))
+GEMINI_TPM = float(os.environ.get("GEMINI_TPM", "250000"))
+GEMINI_BURST = int(os.environ.get("GEMINI_BURST", "3"))
+MAX_CONCURRENT_BATCHES = int(os.environ.get("GEMINI_MAX_CONCURRENT_BATCHES", "3"))
+CHARS_PER_TOKEN = 4           # English input
+# Gujarati output takes ~3x the tokens of the English source
+OUTPUT_TOKEN_FACTOR = float(os.environ.get("GEMINI_OUTPUT_TOKEN_FACTOR", "3.0"))
+# Estimated output tokens packed into one request (kept well below the model's
+# output limit so a long batch is never cut off mid-JSON)
+BATCH_OUTPUT_TOKENS = int(os.environ.get("GEMINI_BATCH_OUTPUT_TOKENS", "24000"))
 DAILY_REQUEST_LIMIT = 40     # User-specified safety limit
+# Extra requests one translation run may spend re-sending keys a response lost,
+# mangled or left untranslated (the quota planner reserves them up front)
+MAX_RECOVERY_REQUESTS = int(os.environ.get("GEMINI_MAX_RECOVERY_REQUESTS", "4"))
 USAGE_FILE = ".gemini_usage.json"
-CACHE_FILE = ".translation_cache.json"
+CACHE_FILE = ".translation_cache.json"  # Legacy JSON cache, imported once into CACHE_DB
+CACHE_DB = ".translation_cache.sqlite3"
+MONGO_DB_URI = os.environ.get("MONGO_DB_URI")
+# Read/write translations through the shared MongoDB store (survives fresh CI runners)
+SHARED_TRANSLATION_STORE = os.environ.get("SHARED_TRANSLATION_STORE", "true").lower() != "false"
+# Count daily requests in MongoDB so concurrent runs share one limit
+SHARED_QUOTA_LEDGER = os.environ.get("SHARED_QUOTA_LEDGER", "true").lower() != "false"
+CACHE_MAX_ENTRIES = int(os.environ.get("TRANSLATION_CACHE_MAX_ENTRIES", "200000"))  # LRU bound, 0 = unbounded
+CACHE_TTL_DAYS = float(os.environ.get("TRANSLATION_CACHE_TTL_DAYS", "0"))  # 0 = entries never expire
+# Sentence-level translation memory: similar earlier sentences are sent as examples
+TRANSLATION_MEMORY = os.environ.get("TRANSLATION_MEMORY", "true").lower() != "false"
+TRANSLATION_MEMORY_THRESHOLD = float(os.environ.get("TRANSLATION_MEMORY_THRESHOLD", "0.5"))
+TRANSLATION_MEMORY_MAX_SENTENCES = int(os.environ.get("TRANSLATION_MEMORY_MAX_SENTENCES", "50000"))
+TRANSLATION_MEMORY_EXAMPLES = int(os.environ.get("TRANSLATION_MEMORY_EXAMPLES", "8"))
 
 class UsageTracker:
     """Tracks Gemini API usage to enforce daily limits."""
@@ -58,43 +94,243 @@ class UsageTracker:
     def can_make_request(self) -> bool:
         return self.count < self.limit
 
-class TranslationCache:
-    """Persistent cache for translations to avoid redundant API calls."""
-    def __init__(self, cache_file: str = CACHE_FILE):
-        self.cache_file = cache_file
-        self.cache = self._load_cache()
+    @property
+    def used(self) -> int:
+        return self.count
+
+    # Same interface as MongoQuotaLedger, for runs without MongoDB
+    async def reserve(self) -> bool:
+        if self.today != datetime.now().strftime("%Y-%m-%d"):
+            self._load_usage()
+        if not self.can_make_request():
+            return False
+        self.increment()
+        return True
 
-    def _load_cache(self) -> Dict[str, str]:
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except: return {}
-        return {}
+    async def release(self):
+        if self.count > 0:
+            self.count -= 1
+            self._save_usage()
+
+    async def remaining(self) -> int:
+        return max(0, self.limit - self.count)
+
+class QuotaExceededError(Exception):
+    pass
 
-    def _save_cache(self):
+def normalize_text(text: str) -> str:
+    """Whitespace-normalize text so trivially different copies share a cache entry."""
+    return " ".join(text.split())
+
+def text_hash(text: str, lang: str) -> str:
+    """Cache key for a text and target language."""
+    return hashlib.sha256(f"{lang}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class TranslationCache:
+    """Persistent translation cache in SQLite (WAL mode) keyed by hashed text and language."""
+    def __init__(self, db_file: str = CACHE_DB, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl_days: float = CACHE_TTL_DAYS, legacy_file: Optional[str] = CACHE_FILE):
+        self.db_file = db_file
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY, lang TEXT NOT NULL, translated TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)")
+        self._conn.commit()
+        if legacy_file:
+            self._import_legacy(legacy_file)
+
+    def _import_legacy(self, legacy_file: str):
+        """Move entries of the old `{lang}:{text}` JSON cache into the database once."""
+        if not os.path.exists(legacy_file):
+            return
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except: pass
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            by_lang: Dict[str, Dict[str, str]] = {}
+            for key, translated in legacy.items():
+                lang, _, text = key.partition(":")
+                by_lang.setdefault(lang, {})[text] = translated
+            for lang, items in by_lang.items():
+                self.set_many(items, lang)
+            os.replace(legacy_file, f"{legacy_file}.imported")
+            logger.info(f"Imported {len(legacy)} translations from {legacy_file}")
+        except Exception as e:
+            logger.warning(f"Could not import legacy translation cache {legacy_file}: {e}")
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get_many(self, texts: Iterable[str], lang: str, track: bool = True) -> Dict[str, str]:
+        """Look up many texts at once; returns {text: translation} for the hits.
+
+        Planning lookups pass track=False so they count neither as hits nor as uses.
+        """
+        keys: Dict[str, List[str]] = {}
+        for text in texts:
+            keys.setdefault(text_hash(text, lang), []).append(text)
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, str] = {}
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translated, created_at FROM translations WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, translated, created_at in rows:
+                    if self._is_expired(created_at, now):
+                        continue
+                    if track:
+                        self._touched[key] = now
+                    for text in keys[key]:
+                        found[text] = translated
+        if not track:
+            return found
+        hits = sum(len(texts) for key, texts in keys.items() if texts[0] in found)
+        self.hits += hits
+        self.misses += sum(len(texts) for texts in keys.values()) - hits
+        return found
 
     def get(self, text: str, lang: str) -> Optional[str]:
-        return self.cache.get(f"{lang}:{text}")
+        return self.get_many([text], lang).get(text)
+
+    def set_many(self, items: Dict[str, str], lang: str):
+        """Store many translations ({text: translation}) in one transaction."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(text_hash(text, lang), lang, translated, now, now) for text, translated in items.items()]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO translations (key, lang, translated, created_at, last_used)"
+                        " VALUES (?, ?, ?, ?, ?)", rows
+                    )
+                    self._flush_touched()
+                    self._evict()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not store translations in cache: {e}")
 
     def set(self, text: str, translated: str, lang: str):
-        self.cache[f"{lang}:{text}"] = translated
-        self._save_cache()
+        self.set_many({text: translated}, lang)
+
+    def _flush_touched(self):
+        """Write buffered last-used times (hits are not written one by one)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        if self.max_entries > 0:
+            count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE key IN"
+                    " (SELECT key FROM translations ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def flush(self):
+        with self._lock:
+            try:
+                with self._conn:
+                    self._flush_touched()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not update translation cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        if stats["hits"] or stats["misses"]:
+            logger.info(f"Translation cache: {stats['hits']} hits, {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%} hit rate)")
 
 # Global instances
 usage_tracker = UsageTracker()
 translation_cache = TranslationCache()
 
+# One complete "key": "value" pair of a JSON object, for salvaging malformed responses
+JSON_PAIR_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def _short_id(index: int) -> str:
+    """Base-36 id: 0-9, a-z, then 10, 11, ..."""
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    short = ""
+    while True:
+        index, digit = divmod(index, 36)
+        short = digits[digit] + short
+        if not index:
+            return short
+
+def encode_batch(content_dict: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Collapse repeated strings of a batch to one entry each under a short id.
+
+    Ids are assigned in order of first appearance, so the same batch always
+    encodes the same way.
+
+    Returns:
+        (source text per id, content keys per id)
+    """
+    ids: Dict[str, str] = {}
+    encoded: Dict[str, str] = {}
+    keys_by_id: Dict[str, List[str]] = {}
+    for key, text in content_dict.items():
+        short = ids.get(text)
+        if short is None:
+            short = ids[text] = _short_id(len(ids))
+            encoded[short] = text
+            keys_by_id[short] = []
+        keys_by_id[short].append(key)
+    return encoded, keys_by_id
+
+def response_schema(ids: Iterable[str]) -> Dict[str, Any]:
+    """Structured-output schema: an object with one required string per id."""
+    ids = list(ids)
+    return {
+        "type": "OBJECT",
+        "properties": {short: {"type": "STRING"} for short in ids},
+        "required": ids,
+        "property_ordering": ids
+    }
+
+def estimate_request_tokens(prompt: str) -> int:
+    """Rough token count of a translation request: the prompt plus its Gujarati output."""
+    input_tokens = len(prompt) // CHARS_PER_TOKEN + 1
+    return int(input_tokens * (1 + OUTPUT_TOKEN_FACTOR))
+
 def is_primarily_gujarati(text: str) -> bool:
     """Check if the given text is primarily in Gujarati script."""
     if not text:
         return False
-    gujarati_pattern = re.compile(r'[\u0A80-\u0AFF]')
-    gujarati_chars = len(gujarati_pattern.findall(text))
+    gujarati_chars, _ = count_scripts(text)
     return gujarati_chars > len(text) * 0.3
 
 def should_skip_translation(text: str) -> bool:
@@ -118,46 +354,59 @@ class GeminiTranslator:
             return
             
         self.client = genai.Client(api_key=api_key)
-        self.last_call_time = 0
+        self.limiter = TokenBucketLimiter(GEMINI_RPM, GEMINI_TPM, GEMINI_BURST)
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._in_flight_loop = None
+
+    def _get_in_flight(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent batches, bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._in_flight is None or self._in_flight_loop is not loop:
+            self._in_flight = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+            self._in_flight_loop = loop
+        return self._in_flight
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=2, min=4, max=10),
-        retry=retry_if_exception_type((Exception)),
+        retry=retry_if_not_exception_type(QuotaExceededError),
         reraise=True
     )
-    async def _call_gemini(self, prompt: str) -> str:
-        """Internal call to Gemini with RPM protection and retry logic."""
+    async def _call_gemini(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> str:
+        """Internal call to Gemini with RPM/TPM limiting and retry logic."""
         if not self.client:
             raise ValueError("Gemini client not initialized.")
 
-        # RPM Throttling
-        elapsed = time.monotonic() - self.last_call_time
-        if elapsed < REQUEST_DELAY_SECONDS:
-            await asyncio.sleep(REQUEST_DELAY_SECONDS - elapsed)
+        estimated_tokens = estimate_request_tokens(prompt)
+        waited = await self.limiter.acquire(estimated_tokens)
+        if waited:
+            logger.info(f"Rate limiter delayed Gemini request by {waited:.1f}s")
 
-        if not usage_tracker.can_make_request():
+        # Reserve the request before sending so concurrent batches and runs cannot overshoot the daily limit
+        ledger = await reserve_quota()
+        if ledger is None:
             logger.error(f"Daily Gemini request limit reached ({DAILY_REQUEST_LIMIT}/day).")
             raise QuotaExceededError("Daily limit reached.")
-
-        logger.info(f"Sending request to Gemini (Daily Count: {usage_tracker.count + 1})")
+        logger.info(f"Sending request to Gemini (Daily Count: {ledger.used}, ~{estimated_tokens} tokens)")
         
-        # google-genai supports both sync and async. We'll use sync in executor for simplicity with existing code
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None, 
-            lambda: self.client.models.generate_content(
+        try:
+            response = await self.client.aio.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=prompt,
                 config={
                     'system_instruction': 'You are a professional English to Gujarati translator. Output valid JSON only.',
-                    'response_mime_type': 'application/json'
+                    'response_mime_type': 'application/json',
+                    **({'response_schema': schema} if schema else {})
                 }
             )
-        )
+        except Exception:
+            await ledger.release()
+            raise
         
-        self.last_call_time = time.monotonic()
-        usage_tracker.increment()
+        usage = getattr(response, "usage_metadata", None)
+        actual_tokens = getattr(usage, "total_token_count", None) if usage else None
+        if actual_tokens:
+            self.limiter.settle(estimated_tokens, actual_tokens)
         
         if not response or not response.text:
             raise ValueError("Gemini returned empty response.")
@@ -181,53 +430,200 @@ class GeminiTranslator:
             
         return text.strip()
 
-    async def translate_batch(self, content_dict: Dict[str, str], target_lang: str = "gu") -> Dict[str, str]:
-        """Translates a dictionary of strings in one batch with caching."""
+    async def translate_batch(self, content_dict: Dict[str, str], target_lang: str = "gu",
+                              question_ids: Optional[Dict[str, str]] = None,
+                              recovery_budget: Optional[List[int]] = None,
+                              lookup: bool = True) -> Dict[str, str]:
+        """Translates a dictionary of strings in one batch with caching.
+
+        Lookups go to the local cache, then the shared MongoDB store, then Gemini.
+        `question_ids` maps content keys to question ids for the shared store;
+        `recovery_budget` holds the recovery requests left (shared by the batches
+        of one run, MAX_RECOVERY_REQUESTS when omitted). Pass lookup=False for
+        batches already known to be missing from the caches.
+        """
         if not content_dict:
             return {}
+        question_ids = question_ids or {}
 
         result = {}
         to_translate = {}
         
-        # 1. Check cache first
+        # 1. Check the caches first (one lookup for the whole batch)
+        known = await lookup_translations(content_dict.values(), target_lang) if lookup else {}
         for key, text in content_dict.items():
-            cached = translation_cache.get(text, target_lang)
-            if cached:
-                result[key] = cached
+            if known.get(text):
+                result[key] = known[text]
             else:
                 to_translate[key] = text
         
         if not to_translate:
             return result
 
-        # 2. Translate only what's not in cache
-        prompt = f"Translate the following English strings into Gujarati script. Preserve JSON keys.\n\n{json.dumps(to_translate, ensure_ascii=False)}"
-        
+        # 3. Translate only what's not in cache, recovering key by key from bad responses
+        translated = await self._translate_with_recovery(
+            to_translate, target_lang, question_ids,
+            recovery_budget if recovery_budget is not None else [MAX_RECOVERY_REQUESTS]
+        )
+        for key, original_val in to_translate.items():
+            # Keys that could not be recovered keep their English text (and are not cached)
+            result[key] = translated.get(key, original_val)
+        if len(translated) < len(to_translate):
+            logger.warning(f"{len(to_translate) - len(translated)} of {len(to_translate)} strings left untranslated")
+        return result
+
+    def _parse_response(self, raw_response: str, expected: Dict[str, str]) -> Dict[str, str]:
+        """Return the translations of the expected keys, salvaging what it can from malformed JSON."""
+        sanitized = self._sanitize_json(raw_response)
         try:
-            raw_response = await self._call_gemini(prompt)
-            sanitized = self._sanitize_json(raw_response)
-            translated_dict = json.loads(sanitized)
-            
-            # Map results back and update cache
-            for key, original_val in to_translate.items():
-                translated_val = translated_dict.get(key, original_val)
-                result[key] = translated_val
-                # Cache it
-                translation_cache.set(original_val, translated_val, target_lang)
-                
-            return result
-            
+            parsed = json.loads(sanitized)
+            if not isinstance(parsed, dict):
+                raise ValueError("response is not a JSON object")
+        except ValueError as e:
+            parsed = {}
+            for match in JSON_PAIR_PATTERN.finditer(sanitized):
+                try:
+                    key, value = json.loads(f'["{match.group(1)}", "{match.group(2)}"]')
+                except ValueError:
+                    continue
+                parsed[key] = value
+            logger.warning(f"Malformed Gemini response ({e}); salvaged {sum(1 for key in parsed if key in expected)} of {len(expected)} keys")
+        return {
+            key: value.strip() for key, value in parsed.items()
+            if key in expected and isinstance(value, str) and value.strip()
+        }
+
+    async def _save_translations(self, sources: Dict[str, str], translated: Dict[str, str],
+                                 target_lang: str, question_ids: Dict[str, str]):
+        """Write translated keys to the local cache and the shared store right away."""
+        translation_cache.set_many({sources[key]: value for key, value in translated.items()}, target_lang)
+        memory = await load_translation_memory(target_lang)
+        store = get_translation_store()
+        if memory is not None:
+            new_sentences = memory.add_many({sources[key]: value for key, value in translated.items()})
+            if store is not None:
+                await store.add_memory_sentences(new_sentences, target_lang)
+        if store is not None:
+            shared_entries = {}
+            for key, value in translated.items():
+                entry = shared_entries.setdefault(text_hash(sources[key], target_lang), {
+                    "source": sources[key],
+                    "translated": value,
+                    "question_ids": []
+                })
+                if question_ids.get(key):
+                    entry["question_ids"].append(question_ids[key])
+            await store.set_many(shared_entries, target_lang)
+
+    async def _translate_with_recovery(self, pending: Dict[str, str], target_lang: str,
+                                       question_ids: Dict[str, str], budget: List[int]) -> Dict[str, str]:
+        """Send one request and re-send only the keys it did not return (or failed validation).
+
+        A partial response is followed by one request for the missing keys; a
+        request that returned nothing is bisected, so one bad string cannot sink
+        the whole batch. `budget` holds the recovery requests left for the run.
+
+        Returns:
+            Translations of the keys that succeeded
+        """
+        # Repeated strings (a country used as an option in five questions) are sent once
+        encoded, keys_by_id = encode_batch(pending)
+        prompt = (
+            "Translate each value of this JSON object from English into Gujarati script, "
+            "keeping its id.\n\n" + json.dumps(encoded, ensure_ascii=False, separators=(",", ":"))
+        )
+        memory = await load_translation_memory(target_lang)
+        if memory is not None:
+            examples = memory.examples(encoded.values(), TRANSLATION_MEMORY_EXAMPLES)
+            if examples:
+                # Earlier translations of similar sentences keep the wording consistent
+                prompt = (
+                    "Earlier translations of similar sentences, as [English, Gujarati] pairs; "
+                    "reuse their wording where it fits:\n"
+                    + json.dumps([[source, target] for source, target, _ in examples],
+                                 ensure_ascii=False, separators=(",", ":"))
+                    + "\n\n" + prompt
+                )
+        translated = {}
+        try:
+            async with self._get_in_flight():
+                raw_response = await self._call_gemini(prompt, response_schema(encoded))
+            by_id = self._parse_response(raw_response, encoded)
+            translated = {key: value for short, value in by_id.items() for key in keys_by_id[short]}
+        except QuotaExceededError:
+            return translated
         except Exception as e:
             logger.error(f"Batch translation failed: {e}")
-            # Fill remaining results with original values if failed
-            for key, val in to_translate.items():
-                result[key] = val
-            return result
 
-class QuotaExceededError(Exception):
-    pass
+        validator = get_translation_validator()
+        if translated and validator is not None:
+            # Unchanged or mostly-English values are retried like lost keys and never cached
+            translated, failed = validator.split(pending, translated)
+            if failed:
+                logger.warning(f"{len(failed)} of {len(pending)} strings came back untranslated")
+
+        if translated:
+            # Cache successes now so a failure further down never pays for them again
+            await self._save_translations(pending, translated, target_lang, question_ids)
+
+        missing = {key: text for key, text in pending.items() if key not in translated}
+        texts = list(dict.fromkeys(missing.values()))
+        if not missing or (not translated and len(texts) == 1):
+            return translated
+        if translated:
+            parts = [missing]
+        else:
+            # Bisect by distinct text so repeats of a string stay in one request
+            first_half = set(texts[:len(texts) // 2])
+            parts = [
+                {key: text for key, text in missing.items() if text in first_half},
+                {key: text for key, text in missing.items() if text not in first_half}
+            ]
+
+        parts, dropped = parts[:budget[0]], parts[budget[0]:]
+        if dropped:
+            keys = sorted(key for part in dropped for key in part)
+            logger.warning(f"No recovery requests left; {len(keys)} strings stay untranslated: {', '.join(keys)}")
+        if not parts:
+            return translated
+        budget[0] -= len(parts)
+        logger.info(f"Retrying {len(missing)} strings in {len(parts)} smaller request(s)")
+        for recovered in await asyncio.gather(*(
+            self._translate_with_recovery(part, target_lang, question_ids, budget) for part in parts
+        )):
+            translated.update(recovered)
+        return translated
 
 _translator: Optional[GeminiTranslator] = None
+_translation_store: Optional[MongoTranslationStore] = None
+
+_translation_memories: Dict[str, TranslationMemory] = {}
+_seeded_memories: set = set()
+
+def get_translation_memory(lang: str) -> Optional[TranslationMemory]:
+    """Sentence-level translation memory of a language, loaded on first use (None if disabled)."""
+    if not TRANSLATION_MEMORY:
+        return None
+    if lang not in _translation_memories:
+        try:
+            _translation_memories[lang] = TranslationMemory(
+                CACHE_DB, lang, TRANSLATION_MEMORY_THRESHOLD, TRANSLATION_MEMORY_MAX_SENTENCES
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory unavailable: {e}")
+            return None
+    return _translation_memories[lang]
+
+async def load_translation_memory(lang: str) -> Optional[TranslationMemory]:
+    """Translation memory of a language, seeded once per run from the shared store."""
+    memory = get_translation_memory(lang)
+    if memory is None or lang in _seeded_memories:
+        return memory
+    _seeded_memories.add(lang)
+    store = get_translation_store()
+    if store is not None:
+        memory.seed(await store.memory_sentences(lang, memory.max_sentences))
+    return memory
 
 def get_translator():
     global _translator
@@ -235,6 +631,97 @@ def get_translator():
         _translator = GeminiTranslator(GEMINI_API_KEY)
     return _translator
 
+def get_translation_store() -> Optional[MongoTranslationStore]:
+    """Shared MongoDB translation store, or None when MongoDB is not configured."""
+    global _translation_store
+    if _translation_store is None and SHARED_TRANSLATION_STORE and MONGO_DB_URI:
+        _translation_store = MongoTranslationStore(MONGO_DB_URI)
+    return _translation_store
+
+_quota_ledger: Optional[MongoQuotaLedger] = None
+
+def get_quota_ledger():
+    """Shared MongoDB quota ledger, or the local usage tracker without MongoDB."""
+    global _quota_ledger
+    if SHARED_QUOTA_LEDGER and MONGO_DB_URI:
+        if _quota_ledger is None:
+            _quota_ledger = MongoQuotaLedger(MONGO_DB_URI, DAILY_REQUEST_LIMIT)
+        return _quota_ledger
+    return usage_tracker
+
+async def reserve_quota():
+    """Reserve one request of today's quota.
+
+    Returns the ledger holding the reservation (release it if the call fails),
+    or None when the daily limit is reached. Falls back to the local tracker
+    if the shared ledger cannot be reached.
+    """
+    ledger = get_quota_ledger()
+    try:
+        return ledger if await ledger.reserve() else None
+    except PyMongoError as e:
+        logger.warning(f"Shared quota ledger unavailable, using local usage file: {e}")
+        return usage_tracker if await usage_tracker.reserve() else None
+
+async def remaining_quota() -> int:
+    """Requests left today according to the active ledger."""
+    ledger = get_quota_ledger()
+    try:
+        return await ledger.remaining()
+    except PyMongoError as e:
+        logger.warning(f"Shared quota ledger unavailable, using local usage file: {e}")
+        return await usage_tracker.remaining()
+
+def close_translation_store():
+    """Close the shared store's MongoDB client and the translation memory, and flush local cache bookkeeping."""
+    global _translation_store, _quota_ledger
+    if _translation_store is not None:
+        _translation_store.close()
+        _translation_store = None
+    if _quota_ledger is not None:
+        _quota_ledger.close()
+        _quota_ledger = None
+    for memory in _translation_memories.values():
+        memory.close()
+    _seeded_memories.clear()
+    _translation_memories.clear()
+    translation_cache.flush()
+
+async def lookup_translations(texts: Iterable[str], target_lang: str, track: bool = True) -> Dict[str, str]:
+    """Known translations that pass validation: local cache first, then the shared store.
+
+    Shared-store hits are copied into the local cache. Planning lookups pass
+    track=False so they do not count as cache hits.
+
+    Returns:
+        Mapping of source text to translation
+    """
+    texts = list(dict.fromkeys(texts))
+    if not texts:
+        return {}
+    validator = get_translation_validator()
+
+    def usable(found: Dict[str, str]) -> Dict[str, str]:
+        # Entries cached before validation existed may hold the English text
+        return {
+            text: value for text, value in found.items()
+            if value and (validator is None or validator.is_valid(text, value))
+        }
+
+    known = usable(translation_cache.get_many(texts, target_lang, track=track))
+    missing = {text_hash(text, target_lang): text for text in texts if text not in known}
+    store = get_translation_store()
+    if missing and store is not None:
+        shared = usable(await store.get_many(missing, target_lang))
+        if shared:
+            translation_cache.set_many(shared, target_lang)
+            from_store = sum(1 for text in missing.values() if text in shared)
+            if from_store:
+                logger.info(f"Shared translation store: {from_store} strings found")
+            for text, value in shared.items():
+                known.setdefault(text, value)
+    return known
+
 async def translate_with_gemini_api(text: str, target_lang: str = "gu") -> str:
     """Wrapper for single string translation."""
     if should_skip_translation(text) or is_primarily_gujarati(text):
@@ -243,77 +730,198 @@ async def translate_with_gemini_api(text: str, target_lang: str = "gu") -> str:
     result = await translator.translate_batch({"text": text}, target_lang)
     return result.get("text", text)
 
+def _flatten_questions(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    all_questions = []
+    if 'categorized_questions' in data:
+        for category in data['categorized_questions']:
+            for q in data['categorized_questions'][category]:
+                all_questions.append(q)
+    return all_questions
+
+def collect_translation_groups(data: Dict[str, Any]) -> Tuple[List[Dict[str, str]], Dict[str, str]]:
+    """Split template data into translatable groups that must stay in one request.
+
+    The title is one group and every question (text, explanation, options) is one group.
+
+    Returns:
+        (groups, key_question_ids) where key_question_ids maps content keys to question ids
+    """
+    groups = []
+    key_question_ids = {}  # content key -> question id, for the shared store
+    if 'title' in data and not should_skip_translation(data['title']):
+        groups.append({"_meta_title": data['title']})
+
+    for q_idx, q in enumerate(_flatten_questions(data)):
+        temp_payload = {}
+        q_text = q.get('question_text', '')
+        q_expl = q.get('explanation', '')
+        
+        if q_text and not should_skip_translation(q_text):
+            temp_payload[f"q_{q_idx}_text"] = q_text
+        if q_expl and not should_skip_translation(q_expl):
+            temp_payload[f"q_{q_idx}_expl"] = q_expl
+        if 'options' in q:
+            for opt_key, opt_val in q['options'].items():
+                if opt_val and not should_skip_translation(opt_val):
+                    temp_payload[f"q_{q_idx}_opt_{opt_key}"] = opt_val
+        if q.get('id'):
+            key_question_ids.update({key: q['id'] for key in temp_payload})
+        if temp_payload:
+            groups.append(temp_payload)
+    return groups, key_question_ids
+
+def estimate_group_tokens(group: Dict[str, str]) -> int:
+    """Estimated Gujarati output tokens of one group: translated text plus its JSON keys."""
+    text_chars = 0
+    key_chars = 0
+    for key, text in group.items():
+        text_chars += len(text)
+        key_chars += len(key) + 6  # quotes, colon, comma
+    return int(text_chars * OUTPUT_TOKEN_FACTOR / CHARS_PER_TOKEN + key_chars / CHARS_PER_TOKEN) + 1
+
+def plan_batches(sizes: List[int], budget: int = BATCH_OUTPUT_TOKENS) -> List[List[int]]:
+    """First-fit decreasing bin packing of item sizes into as few bins of `budget` as possible.
+
+    Items larger than the budget get a bin of their own.
+
+    Returns:
+        Item indexes per bin, each in the original item order
+    """
+    bins: List[List[int]] = []
+    free: List[int] = []
+    for index in sorted(range(len(sizes)), key=sizes.__getitem__, reverse=True):
+        size = sizes[index]
+        for slot, room in enumerate(free):
+            if size <= room:
+                bins[slot].append(index)
+                free[slot] -= size
+                break
+        else:
+            bins.append([index])
+            free.append(budget - size)
+    return [sorted(indexes) for indexes in bins]
+
 async def translate_content(
     data: Union[List[Dict[str, Any]], Dict[str, Any]], 
     target_lang: str = "gu",
     source_lang: str = "en"
 ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
-    """Smart-Batching: Packs Title + All Questions into 1 request (max 30k chars) to minimize quota usage."""
+    """Smart-Batching: Packs Title + All Questions into as few requests as the token budget allows."""
     if target_lang == source_lang or not GEMINI_API_KEY:
         return data
 
-    translator = get_translator()
-    MAX_CHARS_PER_REQ = 30000  # Conservative safety limit for JSON processing
-    
     if isinstance(data, dict):
         # 1. Flatten all questions
-        all_questions = []
-        if 'categorized_questions' in data:
-            for category in data['categorized_questions']:
-                for q in data['categorized_questions'][category]:
-                    all_questions.append(q)
+        all_questions = _flatten_questions(data)
         
         if not all_questions and 'title' in data:
             data['title'] = await translate_with_gemini_api(data['title'], target_lang)
             return data
 
-        # 2. Greedy Packing based on character count
-        current_batch_payload = {}
-        batch_q_indices = [] # To map back
-        title_included = False
-        
-        # Start building the first (and likely only) batch
-        if 'title' in data and not should_skip_translation(data['title']):
-            current_batch_payload["_meta_title"] = data['title']
-            title_included = True
-
-        for q_idx, q in enumerate(all_questions):
-            temp_payload = {}
-            q_text = q.get('question_text', '')
-            q_expl = q.get('explanation', '')
-            
-            if q_text and not should_skip_translation(q_text):
-                temp_payload[f"q_{q_idx}_text"] = q_text
-            if q_expl and not should_skip_translation(q_expl):
-                temp_payload[f"q_{q_idx}_expl"] = q_expl
-            if 'options' in q:
-                for opt_key, opt_val in q['options'].items():
-                    if opt_val and not should_skip_translation(opt_val):
-                        temp_payload[f"q_{q_idx}_opt_{opt_key}"] = opt_val
-            
-            # Check if adding this question exceeds the char limit
-            # (Simplistic check: current length + new payload length)
-            current_size = len(json.dumps(current_batch_payload))
-            new_item_size = len(json.dumps(temp_payload))
-            
-            if current_size + new_item_size > MAX_CHARS_PER_REQ and current_batch_payload:
-                # Send current batch and start a new one
-                translated = await translator.translate_batch(current_batch_payload, target_lang)
-                _apply_translations(data, all_questions, translated)
-                
-                # Reset for next batch
-                current_batch_payload = temp_payload
-            else:
-                # Add to current batch
-                current_batch_payload.update(temp_payload)
-        
-        # Send the final (or only) batch
-        if current_batch_payload:
-            translated = await translator.translate_batch(current_batch_payload, target_lang)
-            _apply_translations(data, all_questions, translated)
+        # 2. Bin-pack whole questions by estimated output tokens
+        await translate_contents({None: data}, target_lang, source_lang)
 
     return data
 
+async def collect_pending_translations(
+    dated: Dict[Any, Dict[str, Any]],
+    target_lang: str = "gu",
+    track: bool = True
+) -> Tuple[List[Tuple[Any, Dict[str, str]]], Dict[Any, Dict[str, str]], Dict[Any, Dict[str, str]]]:
+    """Split the template data of several dates into the work Gemini still has to do.
+
+    The quota planner and translate_contents both build their batches from this,
+    so a plan packs exactly the groups that are later sent.
+
+    Returns:
+        (pending groups as (owner, group) in date order, with cached strings removed,
+         known translations per owner by content key,
+         question id per owner by content key)
+    """
+    collected = {owner: collect_translation_groups(data) for owner, data in dated.items()}
+    texts = [text for groups, _ in collected.values() for group in groups for text in group.values()]
+    known = await lookup_translations(texts, target_lang, track=track)
+
+    pending: List[Tuple[Any, Dict[str, str]]] = []
+    known_by_owner: Dict[Any, Dict[str, str]] = {}
+    for owner, (groups, _) in collected.items():
+        owner_known = known_by_owner[owner] = {}
+        for group in groups:
+            remaining = {}
+            for key, text in group.items():
+                if text in known:
+                    owner_known[key] = known[text]
+                else:
+                    remaining[key] = text
+            if remaining:
+                pending.append((owner, remaining))
+    return pending, known_by_owner, {owner: ids for owner, (_, ids) in collected.items()}
+
+def pending_batch_sizes(pending: List[Tuple[Any, Dict[str, str]]]) -> List[int]:
+    """Estimated output tokens of each pending group (key prefixes are not counted)."""
+    return [estimate_group_tokens(group) for _, group in pending]
+
+async def translate_contents(
+    dated: Dict[Any, Dict[str, Any]],
+    target_lang: str = "gu",
+    source_lang: str = "en",
+    max_recovery_requests: int = MAX_RECOVERY_REQUESTS
+) -> Dict[Any, Dict[str, Any]]:
+    """Translate the template data of several dates with the fewest requests.
+
+    Cached strings are filled in first; the remaining questions of all dates
+    are bin-packed together, so small dates share a request. Keys get a short
+    per-date prefix and the results are applied back to each date's data in
+    place.
+
+    Args:
+        dated: Template data keyed by date (or any other owner key)
+        max_recovery_requests: Extra requests all batches together may spend on recovery
+
+    Returns:
+        The same mapping, translated
+    """
+    if target_lang == source_lang or not GEMINI_API_KEY or not dated:
+        return dated
+
+    translator = get_translator()
+    pending, translated, question_ids = await collect_pending_translations(dated, target_lang)
+    prefixes = {owner: f"d{n}_" if len(dated) > 1 else "" for n, owner in enumerate(dated)}
+    owners = {prefix: owner for owner, prefix in prefixes.items()}
+    key_question_ids = {
+        prefixes[owner] + key: question_id
+        for owner, ids in question_ids.items() for key, question_id in ids.items()
+    }
+
+    batches = []
+    for indexes in plan_batches(pending_batch_sizes(pending)):
+        payload = {}
+        for index in indexes:
+            owner, group = pending[index]
+            payload.update({prefixes[owner] + key: text for key, text in group.items()})
+        batches.append(payload)
+    if batches:
+        logger.info(f"Translating {len(dated)} dates in {len(batches)} packed requests")
+
+    # Send all batches at once; the translator bounds how many are in flight. The
+    # batches hold only strings collect_pending_translations found in neither cache
+    recovery_budget = [max_recovery_requests]
+    results = await asyncio.gather(*(
+        translator.translate_batch(batch, target_lang, key_question_ids, recovery_budget, lookup=False)
+        for batch in batches
+    ))
+    for result in results:
+        for key, value in result.items():
+            prefix = key[:key.index("_") + 1] if len(dated) > 1 else ""
+            translated[owners[prefix]][key[len(prefix):]] = value
+    for owner, data in dated.items():
+        _apply_translations(data, _flatten_questions(data), translated[owner])
+
+    translation_cache.log_stats()
+    if target_lang in _translation_memories:
+        _translation_memories[target_lang].log_stats()
+    return dated
+
 def _apply_translations(data: Dict[str, Any], questions: List[Dict[str, Any]], translated: Dict[str, str]):
     """Helper to map translated dictionary back to the objects."""
     if "_meta_title" in translated:
@@ -0,0 +1,166 @@
+"""
+Compact local index of processed IndiaBix date URLs.
+
+Dates are kept as two bitmaps over day numbers, stored on disk as runs
+of consecutive days: the dates whose processed state was checked against
+MongoDB at the last sync, and the dates known to be processed. While the
+index is fresh and covers every candidate date, a run can decide what to
+skip without a database round trip. URLs that do not follow the date
+pattern are kept in a small list.
+"""
+import os
+import json
+import time
+import logging
+from datetime import date as date_cls
+from typing import Iterable, List, Set, Optional
+from src.core.extractors import extract_date_from_url
+
+logger = logging.getLogger(__name__)
+
+EPOCH_ORDINAL = date_cls(2000, 1, 1).toordinal()
+
+
+def _day_number(url: str) -> Optional[int]:
+    date_str = extract_date_from_url(url)
+    if not date_str:
+        return None
+    try:
+        day = date_cls.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+    return day if day >= 0 else None
+
+
+def _encode_ranges(bits: int) -> List[List[int]]:
+    """Serialise a day bitmap as [first_day, last_day] runs (dates are mostly contiguous)"""
+    ranges = []
+    day = 0
+    while bits:
+        # Skip to the next set bit, then measure the run of set bits
+        skip = (bits & -bits).bit_length() - 1
+        bits >>= skip
+        day += skip
+        run = (~bits & (bits + 1)).bit_length() - 1
+        ranges.append([day, day + run - 1])
+        bits >>= run
+        day += run
+    return ranges
+
+
+def _decode_ranges(ranges: List[List[int]]) -> int:
+    bits = 0
+    for first, last in ranges:
+        bits |= ((1 << (last - first + 1)) - 1) << first
+    return bits
+
+
+class ProcessedURLIndex:
+    """Bitmap index of processed URLs with a freshness window"""
+
+    def __init__(self, path: str, max_age_seconds: float = 6 * 3600):
+        """
+        Initialize the index
+
+        Args:
+            path: File the index is stored in
+            max_age_seconds: How long after a database sync the index is trusted
+        """
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self.checked = 0
+        self.processed = 0
+        self.extra_checked: Set[str] = set()
+        self.extra_processed: Set[str] = set()
+        self.synced_at = 0.0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.checked = _decode_ranges(data.get("checked", []))
+            self.processed = _decode_ranges(data.get("processed", []))
+            self.extra_checked = set(data.get("extra_checked", []))
+            self.extra_processed = set(data.get("extra_processed", []))
+            self.synced_at = float(data.get("synced_at", 0.0))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable processed-URL index {self.path}: {e}")
+            self.checked = self.processed = 0
+            self.extra_checked, self.extra_processed = set(), set()
+            self.synced_at = 0.0
+
+    def save(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "synced_at": self.synced_at,
+                    "checked": _encode_ranges(self.checked),
+                    "processed": _encode_ranges(self.processed),
+                    "extra_checked": sorted(self.extra_checked),
+                    "extra_processed": sorted(self.extra_processed)
+                }, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save processed-URL index {self.path}: {e}")
+
+    def _is_checked(self, url: str) -> bool:
+        day = _day_number(url)
+        if day is None:
+            return url in self.extra_checked
+        return bool(self.checked >> day & 1)
+
+    def is_fresh_for(self, urls: Iterable[str]) -> bool:
+        """True if the last sync is recent and covered every one of the URLs"""
+        if time.time() - self.synced_at > self.max_age_seconds:
+            return False
+        return all(self._is_checked(url) for url in urls)
+
+    def processed_among(self, urls: Iterable[str]) -> Set[str]:
+        """Return the URLs the index knows to be processed"""
+        result = set()
+        for url in urls:
+            day = _day_number(url)
+            if day is None:
+                if url in self.extra_processed:
+                    result.add(url)
+            elif self.processed >> day & 1:
+                result.add(url)
+        return result
+
+    def record_sync(self, checked_urls: Iterable[str], processed_urls: Iterable[str]):
+        """Record the result of a database lookup for a set of candidate URLs"""
+        processed_urls = set(processed_urls)
+        # Only this sync's candidates count as checked; older lookups are stale now
+        self.checked = 0
+        self.extra_checked = set()
+        for url in checked_urls:
+            day = _day_number(url)
+            if day is None:
+                self.extra_checked.add(url)
+                if url in processed_urls:
+                    self.extra_processed.add(url)
+                else:
+                    self.extra_processed.discard(url)
+                continue
+            self.checked |= 1 << day
+            if url in processed_urls:
+                self.processed |= 1 << day
+            else:
+                self.processed &= ~(1 << day)
+        self.synced_at = time.time()
+        self.save()
+
+    def mark_processed(self, url: str):
+        """Record a URL this process has just marked as processed"""
+        day = _day_number(url)
+        if day is None:
+            self.extra_checked.add(url)
+            self.extra_processed.add(url)
+        else:
+            self.checked |= 1 << day
+            self.processed |= 1 << day
+        self.save()
@@ -168,10 +168,16 @@ def setup_mongodb_connection(mongo_uri: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Unexpected error connecting to MongoDB: {e}. Continuing without database storage.")
         return None
 
-def get_processed_urls(mongo_uri: Optional[str] = None) -> Set[str]:
-    """Get all previously processed URLs from MongoDB that had data"""
+def get_processed_urls(mongo_uri: Optional[str] = None, urls: Optional[List[str]] = None) -> Set[str]:
+    """Get previously processed URLs from MongoDB that had data
+    
+    If `urls` is given only those candidates are looked up (one `$in` query on the
+    indexed url field) instead of loading every processed URL ever recorded.
+    """
     if not mongo_uri:
         return set()
+    if urls is not None and not urls:
+        return set()
         
     try:
         client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
@@ -179,9 +185,12 @@ def get_processed_urls(mongo_uri: Optional[str] = None) -> Set[str]:
         processed_urls_collection = db['scraped_urls']
         
         # Only get URLs that had data
+        query = {"has_data": True}
+        if urls is not None:
+            query["url"] = {"$in": list(urls)}
         processed_urls = {doc["url"] for doc in processed_urls_collection.find(
-            {"has_data": True}, 
-            {"url": 1}
+            query, 
+            {"url": 1, "_id": 0}
         )}
         logger.info(f"Found {len(processed_urls)} previously processed URLs with data in MongoDB")
         return processed_urls